@@ -6,11 +6,20 @@ import os
 import sqlite3
 import json
 import logging
+from logging.handlers import QueueHandler, QueueListener
+import atexit
 import time
-import re # Added for MAC address validation
+import zlib
+import itertools
+import queue
+import bisect
+import threading
+import concurrent.futures
+from contextlib import contextmanager
 from typing import Optional # Added for type hinting
 # import html # Not currently used
-from urllib.parse import urlparse, parse_qs
+from urllib.parse import urlparse, unquote_plus, urlencode
+from functools import lru_cache
 from datetime import datetime, timezone, timedelta
 import asyncio
 
@@ -29,19 +38,30 @@ except ImportError:
     print("\nError: Required library 'requests' not found. Please install it: pip install requests", file=sys.stderr)
     sys.exit(1)
 
+try:
+    import orjson # Optional: faster parsing of large player_api listings
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+try:
+    import ijson # Optional: incremental parsing of very large stream listings
+except ImportError:
+    ijson = None
+
 try:
     from PySide6.QtWidgets import (
         QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
         QTableView, QPushButton, QDialog, QLineEdit, QComboBox,
         QFormLayout, QMessageBox, QDialogButtonBox, QLabel, QGridLayout,
-        QListWidget, QListWidgetItem, QInputDialog, QMenu,
+        QListWidget, QInputDialog, QMenu,
         QAbstractItemView, QHeaderView, QStatusBar, QProgressBar,
         QFileDialog, QTreeWidget, QTreeWidgetItem, QCheckBox
     )
-    from PySide6.QtGui import QStandardItemModel, QStandardItem, QColor, QAction, QIcon, QKeySequence, QGuiApplication
+    from PySide6.QtGui import QColor, QBrush, QAction, QIcon, QKeySequence, QGuiApplication
     from PySide6.QtCore import (
         Qt, Slot, Signal, QObject, QThread, QModelIndex, QSortFilterProxyModel,
-        QDateTime, QTimer
+        QAbstractTableModel, QTimer, QStringListModel, QSignalBlocker
     )
 except ImportError:
     print("\nError: Required library 'PySide6' not found. Please install it: pip install PySide6", file=sys.stderr)
@@ -59,7 +79,16 @@ DATABASE_NAME = 'iptv_store.db'
 LOG_FILE = 'iptv_manager_log.txt'
 USER_AGENT = f'{APP_NAME}/{APP_VERSION} (okhttp/3.12.1)'
 API_TIMEOUT = (5, 10) # (connect, read) seconds
-REQUEST_DELAY_BETWEEN_CHECKS = 0.2
+REQUEST_DELAY_BETWEEN_CHECKS = 0.2 # Minimum spacing between checks against the same host
+MAX_CONCURRENT_CHECKS = 16 # Checks in flight at once across all hosts
+STATUS_FLUSH_INTERVAL_MS = 200 # Max delay before buffered check results hit the DB
+STATUS_FLUSH_BATCH_SIZE = 64
+STREAM_READ_CHUNK_SIZE = 64 * 1024
+STREAM_INCREMENTAL_MIN_BYTES = 4 * 1024 * 1024 # Listings this large (or unsized) are parsed and shown in chunks when ijson is available
+STREAM_EMIT_CHUNK_SIZE = 1000
+STALKER_PORTAL_CACHE_TTL = 300 # Seconds a handshaken portal session is reused across workers
+MAX_CHECK_BACKOFF = 86400 # Longest freeze after repeated failed checks (24h)
+_MAX_BACKOFF_SHIFT = 11 # 60 << 11 already exceeds MAX_CHECK_BACKOFF
 SETTINGS_FILE = "settings.json"
 
 REPORT_DISPLAY_TIMEZONE = "America/Los_Angeles" # Example
@@ -69,291 +98,528 @@ except zoneinfo.ZoneInfoNotFoundError:
     DISPLAY_TZ = timezone.utc
 
 # --- Setup Logging ---
-logging.basicConfig(
-    level=logging.DEBUG, # Keep DEBUG for now
-    format='%(asctime)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s',
-    filename=LOG_FILE,
-    filemode='w'
-)
+# Threads only enqueue records; a background QueueListener does the file/console I/O.
+file_handler = logging.FileHandler(LOG_FILE, mode='w')
+file_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s'))
 console_handler = logging.StreamHandler(sys.stderr)
 console_handler.setLevel(logging.WARNING)
 formatter = logging.Formatter('%(levelname)s: %(message)s')
 console_handler.setFormatter(formatter)
-logging.getLogger('').addHandler(console_handler)
+log_queue = queue.SimpleQueue()
+log_listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+root_logger = logging.getLogger('')
+root_logger.setLevel(logging.DEBUG) # Keep DEBUG for now
+root_logger.addHandler(QueueHandler(log_queue))
+log_listener.start()
+atexit.register(log_listener.stop)
 logging.getLogger("requests").setLevel(logging.WARNING)
 logging.getLogger("urllib3").setLevel(logging.WARNING)
 
 # =============================================================================
 # DATABASE UTILITIES
 # =============================================================================
+DB_POOL_SIZE = 4
+DB_MAX_IN_PARAMS = 500 # Ids per "IN (...)" statement, well under SQLite's bound-variable limit
+# Applied once per pooled connection so the page cache stays warm between calls.
+DB_CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",
+)
+
 def get_db_connection():
-    conn = sqlite3.connect(DATABASE_NAME)
+    conn = sqlite3.connect(DATABASE_NAME, check_same_thread=False)
     conn.row_factory = sqlite3.Row
+    for pragma in DB_CONNECTION_PRAGMAS:
+        conn.execute(pragma)
     return conn
 
-def initialize_database():
-    logging.info(f"Initializing database: {DATABASE_NAME}")
-    conn = None
-    try:
-        if not os.path.exists(DATABASE_NAME):
-            logging.info(f"Database not found. Creating '{DATABASE_NAME}'...")
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS entries (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                category TEXT DEFAULT 'Uncategorized',
-                server_base_url TEXT NOT NULL,
-                username TEXT NOT NULL,
-                password TEXT NOT NULL,
-                last_checked_at TEXT,
-                api_status TEXT,
-                api_message TEXT,
-                expiry_date_ts INTEGER,
-                is_trial INTEGER,
-                active_connections INTEGER,
-                max_connections INTEGER,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                raw_user_info TEXT,
-                raw_server_info TEXT,
-                account_type TEXT DEFAULT 'xc',
-                mac_address TEXT,
-                portal_url TEXT,
-                bad_count INTEGER DEFAULT 0,
-                frozen_until REAL DEFAULT 0
-            )
-        ''')
-        # Add new columns if they don't exist (for existing databases)
-        try:
-            cursor.execute("SELECT account_type FROM entries LIMIT 1")
-        except sqlite3.OperationalError:
-            logging.info("Adding 'account_type' column to entries table.")
-            cursor.execute("ALTER TABLE entries ADD COLUMN account_type TEXT DEFAULT 'xc'")
-        try:
-            cursor.execute("SELECT mac_address FROM entries LIMIT 1")
-        except sqlite3.OperationalError:
-            logging.info("Adding 'mac_address' column to entries table.")
-            cursor.execute("ALTER TABLE entries ADD COLUMN mac_address TEXT")
-        try:
-            cursor.execute("SELECT portal_url FROM entries LIMIT 1")
-        except sqlite3.OperationalError:
-            logging.info("Adding 'portal_url' column to entries table.")
-            cursor.execute("ALTER TABLE entries ADD COLUMN portal_url TEXT")
+class _ConnectionPool:
+    """Small LIFO pool of long-lived SQLite connections shared by the DB helpers.
 
-        # Add columns for category counts
-        try:
-            cursor.execute("SELECT live_streams_count FROM entries LIMIT 1")
-        except sqlite3.OperationalError:
-            logging.info("Adding 'live_streams_count' column to entries table.")
-            cursor.execute("ALTER TABLE entries ADD COLUMN live_streams_count INTEGER")
-        try:
-            cursor.execute("SELECT movies_count FROM entries LIMIT 1")
-        except sqlite3.OperationalError:
-            logging.info("Adding 'movies_count' column to entries table.")
-            cursor.execute("ALTER TABLE entries ADD COLUMN movies_count INTEGER")
-        try:
-            cursor.execute("SELECT series_count FROM entries LIMIT 1")
-        except sqlite3.OperationalError:
-            logging.info("Adding 'series_count' column to entries table.")
-            cursor.execute("ALTER TABLE entries ADD COLUMN series_count INTEGER")
+    Connections are opened lazily up to ``size``; callers block when all of them
+    are checked out. A connection is only ever used by one thread at a time.
+    """
+    def __init__(self, size=DB_POOL_SIZE):
+        self._size = size
+        self._idle = queue.LifoQueue()
+        self._all = []
+        self._lock = threading.Lock()
 
+    def _checkout(self):
         try:
-            cursor.execute("SELECT bad_count FROM entries LIMIT 1")
-        except sqlite3.OperationalError:
-            logging.info("Adding 'bad_count' column to entries table.")
-            cursor.execute("ALTER TABLE entries ADD COLUMN bad_count INTEGER DEFAULT 0")
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if len(self._all) < self._size:
+                conn = get_db_connection()
+                self._all.append(conn)
+                return conn
+        return self._idle.get()
+
+    @contextmanager
+    def acquire(self):
+        conn = self._checkout()
         try:
-            cursor.execute("SELECT frozen_until FROM entries LIMIT 1")
-        except sqlite3.OperationalError:
-            logging.info("Adding 'frozen_until' column to entries table.")
-            cursor.execute("ALTER TABLE entries ADD COLUMN frozen_until REAL DEFAULT 0")
-
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS categories (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT UNIQUE NOT NULL
-            )
-        ''')
-        cursor.execute("INSERT OR IGNORE INTO categories (name) VALUES ('Uncategorized')")
-        conn.commit()
+            yield conn
+        finally:
+            # Never hand a connection back with a half-finished transaction.
+            if conn.in_transaction:
+                conn.rollback()
+            self._idle.put(conn)
+
+    def close_all(self):
+        with self._lock:
+            for conn in self._all:
+                try: conn.close()
+                except sqlite3.Error as e: logging.warning("Error closing pooled DB connection: %s", e)
+            self._all.clear()
+            self._idle = queue.LifoQueue()
+
+_POOL = _ConnectionPool()
+
+# Columns added after the first release, applied to older databases on startup.
+ENTRY_MIGRATION_COLUMNS = (
+    ("account_type", "TEXT DEFAULT 'xc'"),
+    ("mac_address", "TEXT"),
+    ("portal_url", "TEXT"),
+    ("live_streams_count", "INTEGER"),
+    ("movies_count", "INTEGER"),
+    ("series_count", "INTEGER"),
+    ("bad_count", "INTEGER DEFAULT 0"),
+    ("frozen_until", "REAL DEFAULT 0"),
+    ("raw_user_info_z", "BLOB"),
+    ("raw_server_info_z", "BLOB"),
+    ("last_checked_ts", "INTEGER"), # Unix seconds; supersedes the ISO text in last_checked_at
+    ("mac_address_b", "BLOB"), # 6 raw bytes; the mac_address text stays for display and export
+)
+
+ENTRY_INDEXES = (
+    # Matches get_all_entries(category): index walk in name order, no sort step.
+    "CREATE INDEX IF NOT EXISTS idx_entries_cat_name ON entries(category, name COLLATE NOCASE)",
+    # Same for the unfiltered listing in the default name order.
+    "CREATE INDEX IF NOT EXISTS idx_entries_name ON entries(name COLLATE NOCASE)",
+    # Partial index over frozen entries only; queries must repeat "frozen_until > 0" to use it.
+    "CREATE INDEX IF NOT EXISTS idx_entries_frozen ON entries(frozen_until) WHERE frozen_until > 0",
+)
+
+def initialize_database():
+    logging.info("Initializing database: %s", DATABASE_NAME)
+    try:
+        if not os.path.exists(DATABASE_NAME):
+            logging.info("Database not found. Creating '%s'...", DATABASE_NAME)
+        with _POOL.acquire() as conn, conn:
+            cursor = conn.cursor()
+            # DDL does not open a transaction implicitly; do it so the schema commits once.
+            cursor.execute("BEGIN")
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS entries (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT NOT NULL,
+                    category TEXT DEFAULT 'Uncategorized',
+                    server_base_url TEXT NOT NULL,
+                    username TEXT NOT NULL,
+                    password TEXT NOT NULL,
+                    last_checked_at TEXT,
+                    api_status TEXT,
+                    api_message TEXT,
+                    expiry_date_ts INTEGER,
+                    is_trial INTEGER,
+                    active_connections INTEGER,
+                    max_connections INTEGER,
+                    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                    raw_user_info TEXT,
+                    raw_server_info TEXT,
+                    account_type TEXT DEFAULT 'xc',
+                    mac_address TEXT,
+                    portal_url TEXT,
+                    bad_count INTEGER DEFAULT 0,
+                    frozen_until REAL DEFAULT 0
+                )
+            ''')
+            # Add new columns if they don't exist (for existing databases)
+            existing_columns = {row[1] for row in cursor.execute("PRAGMA table_info(entries)")}
+            for column, declaration in ENTRY_MIGRATION_COLUMNS:
+                if column not in existing_columns:
+                    logging.info("Adding '%s' column to entries table.", column)
+                    cursor.execute(f"ALTER TABLE entries ADD COLUMN {column} {declaration}")
+            if 'last_checked_ts' not in existing_columns:
+                cursor.execute('''
+                    UPDATE entries SET last_checked_ts = CAST(strftime('%s', last_checked_at) AS INTEGER)
+                    WHERE last_checked_at IS NOT NULL AND strftime('%s', last_checked_at) IS NOT NULL
+                ''')
+            if 'mac_address_b' not in existing_columns:
+                rows = cursor.execute(
+                    "SELECT id, mac_address FROM entries WHERE mac_address IS NOT NULL AND mac_address != ''"
+                ).fetchall()
+                cursor.executemany("UPDATE entries SET mac_address_b = ? WHERE id = ?",
+                                   [(mac_to_blob(mac), entry_id) for entry_id, mac in rows])
+            for index_sql in ENTRY_INDEXES:
+                cursor.execute(index_sql)
+
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS categories (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT UNIQUE NOT NULL
+                )
+            ''')
+            cursor.execute("INSERT OR IGNORE INTO categories (name) VALUES ('Uncategorized')")
+        _invalidate_category_cache()
         logging.info("Database initialized/verified successfully.")
         return True
     except sqlite3.Error as e:
-        logging.error(f"Database initialization error: {e}")
+        logging.error("Database initialization error: %s", e)
         print(f"CRITICAL: Database initialization error: {e}", file=sys.stderr)
         return False
-    finally:
-        if conn: conn.close()
+
+def mac_to_blob(mac):
+    """Packs 'AA:BB:CC:DD:EE:FF' (or dash-separated) into 6 bytes; None if it is not a MAC."""
+    if not mac or not is_valid_mac(mac):
+        return None
+    return bytes.fromhex(mac.replace(':', '').replace('-', ''))
 
 def add_entry(name, category, server_url, username, password, account_type='xc', mac_address=None, portal_url=None):
-    conn = get_db_connection()
-    try:
+    with _POOL.acquire() as conn:
         cursor = conn.execute('''
-            INSERT INTO entries (name, category, server_base_url, username, password, account_type, mac_address, portal_url)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (name, category, server_url, username, password, account_type, mac_address, portal_url))
+            INSERT INTO entries (name, category, server_base_url, username, password, account_type,
+                                 mac_address, mac_address_b, portal_url)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (name, category, server_url, username, password, account_type,
+              mac_address, mac_to_blob(mac_address), portal_url))
         conn.commit()
         entry_id = cursor.lastrowid
-        logging.info(f"Added entry: {name} (ID: {entry_id}, Type: {account_type})")
-        return entry_id
-    finally: conn.close()
+    logging.info("Added entry: %s (ID: %s, Type: %s)", name, entry_id, account_type)
+    return entry_id
+
+def add_entries_bulk(rows):
+    """Insert many (name, category, server_url, username, password, account_type, mac_address, portal_url)
+    rows in a single transaction."""
+    with _POOL.acquire() as conn, conn:
+        conn.executemany('''
+            INSERT INTO entries (name, category, server_base_url, username, password, account_type,
+                                 mac_address, mac_address_b, portal_url)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', [(*row[:7], mac_to_blob(row[6]), row[7]) for row in rows])
+    logging.info("Added %s entries", len(rows))
 
 def update_entry(entry_id, name, category, server_url, username, password, account_type='xc', mac_address=None, portal_url=None):
-    conn = get_db_connection()
-    try:
+    with _POOL.acquire() as conn:
         conn.execute('''
             UPDATE entries
             SET name = ?, category = ?, server_base_url = ?, username = ?, password = ?,
-                account_type = ?, mac_address = ?, portal_url = ?
+                account_type = ?, mac_address = ?, mac_address_b = ?, portal_url = ?
             WHERE id = ?
-        ''', (name, category, server_url, username, password, account_type, mac_address, portal_url, entry_id))
+        ''', (name, category, server_url, username, password, account_type,
+              mac_address, mac_to_blob(mac_address), portal_url, entry_id))
         conn.commit()
-        logging.info(f"Updated entry ID: {entry_id} (Type: {account_type})")
-    finally: conn.close()
-
-def update_entry_category(entry_id, category):
-    conn = get_db_connection()
-    try:
-        conn.execute("UPDATE entries SET category = ? WHERE id = ?", (category, entry_id))
-        conn.commit()
-        logging.info(f"Updated category for entry ID: {entry_id} to {category}")
-    finally:
-        conn.close()
-
-def delete_entry(entry_id):
-    conn = get_db_connection()
-    try:
-        conn.execute("DELETE FROM entries WHERE id = ?", (entry_id,))
-        conn.commit()
-        logging.info(f"Deleted entry ID: {entry_id}")
-    finally: conn.close()
-
-def get_all_entries(category_filter=None):
-    conn = get_db_connection()
-    try:
-        query = "SELECT * FROM entries"
-        params = []
-        if category_filter and category_filter != "All Categories":
-            query += " WHERE category = ?"
-            params.append(category_filter)
-        query += " ORDER BY name COLLATE NOCASE ASC"
-        entries = conn.execute(query, params).fetchall()
-        return entries
-    finally: conn.close()
+    logging.info("Updated entry ID: %s (Type: %s)", entry_id, account_type)
+
+def bulk_update_category(entry_ids, category):
+    """Move many entries to one category in a single transaction."""
+    entry_ids = list(entry_ids)
+    with _POOL.acquire() as conn, conn:
+        for start in range(0, len(entry_ids), DB_MAX_IN_PARAMS):
+            chunk = entry_ids[start:start + DB_MAX_IN_PARAMS]
+            conn.execute(f"UPDATE entries SET category = ? WHERE id IN ({','.join('?' * len(chunk))})",
+                         (category, *chunk))
+    logging.info("Updated category for %s entries to %s", len(entry_ids), category)
+
+def delete_entries(entry_ids):
+    """Delete many entries in a single transaction."""
+    entry_ids = list(entry_ids)
+    with _POOL.acquire() as conn, conn:
+        for start in range(0, len(entry_ids), DB_MAX_IN_PARAMS):
+            chunk = entry_ids[start:start + DB_MAX_IN_PARAMS]
+            conn.execute(f"DELETE FROM entries WHERE id IN ({','.join('?' * len(chunk))})", chunk)
+    logging.info("Deleted %s entries", len(entry_ids))
+
+# Duplicates share credentials and account type. Within each group the most recently checked entry
+# (then the lowest id) is kept, and every other id is returned.
+_DUPLICATE_IDS_SQL = """
+    SELECT id FROM (
+        SELECT id,
+               ROW_NUMBER() OVER (
+                   PARTITION BY
+                       CASE
+                           WHEN COALESCE(account_type, 'xc') = 'stalker' THEN portal_url
+                           ELSE server_base_url
+                       END,
+                       CASE
+                           -- Packed MAC, so case and ':'/'-' differences still match
+                           WHEN COALESCE(account_type, 'xc') = 'stalker' THEN COALESCE(mac_address_b, mac_address)
+                           ELSE username
+                       END,
+                       CASE
+                           WHEN COALESCE(account_type, 'xc') = 'stalker' THEN ''
+                           ELSE password
+                       END,
+                       COALESCE(account_type, 'xc')
+                   ORDER BY
+                       last_checked_ts DESC,
+                       id ASC
+               ) as rn
+        FROM entries
+    ) WHERE rn > 1
+"""
+
+def get_duplicate_ids():
+    with _POOL.acquire() as conn:
+        return [row['id'] for row in conn.execute(_DUPLICATE_IDS_SQL)]
+
+# Column lists are built once at import; the raw API blobs are never loaded into the table.
+_LIST_COLUMNS = (
+    'id', 'name', 'category', 'account_type', 'server_base_url', 'username', 'portal_url', 'mac_address',
+    'api_status', 'api_message', 'expiry_date_ts', 'is_trial', 'active_connections', 'max_connections',
+    'last_checked_ts', 'bad_count', 'frozen_until', 'live_streams_count', 'movies_count', 'series_count',
+)
+_ENTRY_COLUMNS = _LIST_COLUMNS + ('password', 'created_at')
+_LIST_COLS = ", ".join(_LIST_COLUMNS)
+_ENTRY_COLS = ", ".join(_ENTRY_COLUMNS)
+
+# Whitelisted ORDER BY expressions for get_all_entries(); keys are what the UI may ask for.
+ENTRY_SORT_EXPRESSIONS = {
+    'id': "id",
+    'name': "name COLLATE NOCASE",
+    'category': "category COLLATE NOCASE",
+    'api_status': "COALESCE(api_status, 'Not Checked') COLLATE NOCASE",
+    'live_streams_count': "live_streams_count",
+    'movies_count': "movies_count",
+    'series_count': "series_count",
+    'expiry_date_ts': "expiry_date_ts",
+    'is_trial': "is_trial",
+    'active_connections': "active_connections",
+    'max_connections': "max_connections",
+    'last_checked_ts': "last_checked_ts",
+    'server': "CASE WHEN account_type = 'stalker' THEN portal_url ELSE server_base_url END COLLATE NOCASE",
+    'user': "CASE WHEN account_type = 'stalker' THEN mac_address ELSE username END COLLATE NOCASE",
+    'api_message': "api_message COLLATE NOCASE",
+}
+# Sort keys that are expressions rather than a column of the row
+ENTRY_SORT_COMPUTED_KEYS = frozenset(('server', 'user'))
+
+def _sorted_entries_query(columns, category_filter, sort_key, descending):
+    query = f"SELECT {columns} FROM entries"
+    params = []
+    if category_filter and category_filter != "All Categories":
+        query += " WHERE category = ?"
+        params.append(category_filter)
+    direction = "DESC" if descending else "ASC"
+    order_expr = ENTRY_SORT_EXPRESSIONS.get(sort_key, ENTRY_SORT_EXPRESSIONS['name'])
+    query += f" ORDER BY {order_expr} {direction}, id ASC"
+    return query, params
+
+def get_all_entries(category_filter=None, sort_key='name', descending=False):
+    query, params = _sorted_entries_query(_LIST_COLS, category_filter, sort_key, descending)
+    with _POOL.acquire() as conn:
+        return conn.execute(query, params).fetchall()
+
+def get_sorted_entry_ids(category_filter=None, sort_key='name', descending=False):
+    """Just the ids, in get_all_entries() order."""
+    query, params = _sorted_entries_query("id", category_filter, sort_key, descending)
+    with _POOL.acquire() as conn:
+        return [row[0] for row in conn.execute(query, params)]
 
 def get_entry_by_id(entry_id):
-    conn = get_db_connection()
-    try:
-        entry = conn.execute("SELECT * FROM entries WHERE id = ?", (entry_id,)).fetchone()
-        return entry
-    finally: conn.close()
-
-def update_entry_status(entry_id, status_data):
-    conn = get_db_connection()
+    with _POOL.acquire() as conn:
+        return conn.execute(f"SELECT {_ENTRY_COLS} FROM entries WHERE id = ?", (entry_id,)).fetchone()
+
+def get_entries_by_ids(entry_ids):
+    """The get_all_entries() columns for just these ids, in no particular order."""
+    entry_ids = list(entry_ids)
+    rows = []
+    with _POOL.acquire() as conn:
+        for start in range(0, len(entry_ids), DB_MAX_IN_PARAMS):
+            chunk = entry_ids[start:start + DB_MAX_IN_PARAMS]
+            rows.extend(conn.execute(f"SELECT {_LIST_COLS} FROM entries WHERE id IN ({','.join('?' * len(chunk))})", chunk))
+    return rows
+
+RAW_COMPRESSION_LEVEL = 6
+
+def compress_raw(value):
+    """zlib-compress a raw API response (str or bytes) for the *_z BLOB columns."""
+    if value is None: return None
+    if isinstance(value, str): value = value.encode('utf-8')
+    return zlib.compress(value, RAW_COMPRESSION_LEVEL)
+
+# Parameter order for UPDATE_ENTRY_STATUS_SQL; the entry id comes last.
+_STATUS_FIELDS = (
+    'api_status', 'api_message', 'expiry_date_ts', 'is_trial',
+    'active_connections', 'max_connections', 'raw_user_info', 'raw_server_info',
+    'live_streams_count', 'movies_count', 'series_count', 'check_failed', 'frozen_until',
+)
+_COMPRESSED_STATUS_FIELDS = frozenset(('raw_user_info', 'raw_server_info'))
+# Raw responses go to the compressed *_z columns; the legacy TEXT copies are cleared.
+# check_failed is 1/0 from the checker loop (bump / reset bad_count in place); NULL, like a NULL
+# frozen_until, leaves the stored backoff state alone.
+UPDATE_ENTRY_STATUS_SQL = '''
+    UPDATE entries
+    SET last_checked_ts = ?, api_status = ?, api_message = ?,
+        expiry_date_ts = ?, is_trial = ?, active_connections = ?,
+        max_connections = ?, raw_user_info_z = ?, raw_server_info_z = ?,
+        raw_user_info = NULL, raw_server_info = NULL,
+        live_streams_count = ?, movies_count = ?, series_count = ?,
+        bad_count = CASE ? WHEN 1 THEN COALESCE(bad_count, 0) + 1 WHEN 0 THEN 0 ELSE bad_count END,
+        frozen_until = COALESCE(?, frozen_until)
+    WHERE id = ?
+'''
+
+def status_row(entry_id, status_data, checked_at=None):
+    """Flatten a checker result dict into a parameter tuple for update_entry_status_bulk.
+
+    ``checked_at`` is Unix seconds; pass one value for a whole batch.
+    """
+    if checked_at is None:
+        checked_at = int(time.time())
+    values = [compress_raw(status_data.get(field)) if field in _COMPRESSED_STATUS_FIELDS else status_data.get(field)
+              for field in _STATUS_FIELDS]
+    return (checked_at, *values, entry_id)
+
+def update_entry_status_bulk(rows):
+    """Write many status_row() tuples in one transaction. Returns True on success."""
+    if not rows: return True
     try:
-        current_time_iso = datetime.now(timezone.utc).isoformat()
-
-        # Prepare params, handling the optional new fields
-        params = [
-            current_time_iso, status_data.get('api_status'), status_data.get('api_message'),
-            status_data.get('expiry_date_ts'), status_data.get('is_trial'),
-            status_data.get('active_connections'), status_data.get('max_connections'),
-            status_data.get('raw_user_info'), status_data.get('raw_server_info'),
-            status_data.get('live_streams_count'), status_data.get('movies_count'),
-            status_data.get('series_count')
-        ]
-
-        query = '''
-            UPDATE entries
-            SET last_checked_at = ?, api_status = ?, api_message = ?,
-                expiry_date_ts = ?, is_trial = ?, active_connections = ?,
-                max_connections = ?, raw_user_info = ?, raw_server_info = ?,
-                live_streams_count = ?, movies_count = ?, series_count = ?
-        '''
-
-        # Add frozen/bad_count updates if present
-        if 'bad_count' in status_data:
-            query += ", bad_count = ?"
-            params.append(status_data['bad_count'])
-        if 'frozen_until' in status_data:
-            query += ", frozen_until = ?"
-            params.append(status_data['frozen_until'])
-
-        query += " WHERE id = ?"
-        params.append(entry_id)
-
-        conn.execute(query, params)
-        conn.commit()
-        logging.info(f"Updated status for entry ID: {entry_id} to {status_data.get('api_status')}")
-    except Exception as e: logging.error(f"Failed to update status for entry ID {entry_id}: {e}")
-    finally: conn.close()
+        with _POOL.acquire() as conn, conn:
+            conn.executemany(UPDATE_ENTRY_STATUS_SQL, rows)
+        logging.info("Updated status for %s entries.", len(rows))
+        return True
+    except Exception as e:
+        logging.error("Failed to bulk update status for %s entries: %s", len(rows), e)
+        return False
 
 def get_all_categories():
-    conn = get_db_connection()
-    try:
+    with _POOL.acquire() as conn:
         categories = conn.execute("SELECT name FROM categories ORDER BY name COLLATE NOCASE ASC").fetchall()
-        return [cat['name'] for cat in categories]
-    finally: conn.close()
+    return [cat['name'] for cat in categories]
+
+# The category list changes only through the functions below, which bump _CATEGORY_VERSION;
+# dialogs read it through get_all_categories_cached() instead of re-querying on every open.
+_CATEGORY_VERSION = 0
+_CATEGORY_CACHE = {'version': -1, 'items': None}
+
+def _invalidate_category_cache():
+    global _CATEGORY_VERSION
+    _CATEGORY_VERSION += 1
+
+def get_all_categories_cached():
+    if _CATEGORY_CACHE['version'] != _CATEGORY_VERSION or _CATEGORY_CACHE['items'] is None:
+        _CATEGORY_CACHE['items'] = tuple(get_all_categories())
+        _CATEGORY_CACHE['version'] = _CATEGORY_VERSION
+    return list(_CATEGORY_CACHE['items'])
+
+_CATEGORY_MODEL = {'version': -1, 'model': None}
+
+def category_model():
+    """QStringListModel of category names shared by every dialog's category combo (GUI thread only).
+
+    Combos must not clear() or addItem() on it; that would edit the list for every dialog.
+    """
+    if _CATEGORY_MODEL['model'] is None:
+        _CATEGORY_MODEL['model'] = QStringListModel()
+    if _CATEGORY_MODEL['version'] != _CATEGORY_VERSION:
+        _CATEGORY_MODEL['model'].setStringList(get_all_categories_cached() or ["Uncategorized"])
+        _CATEGORY_MODEL['version'] = _CATEGORY_VERSION
+    return _CATEGORY_MODEL['model']
+
+def get_category_counts():
+    """Return {category: entry_count} computed by SQLite in one grouped scan."""
+    with _POOL.acquire() as conn:
+        rows = conn.execute("SELECT category, COUNT(*) FROM entries GROUP BY category").fetchall()
+    return {row[0]: row[1] for row in rows}
 
 def add_category(name):
-    conn = get_db_connection()
     try:
-        conn.execute("INSERT OR IGNORE INTO categories (name) VALUES (?)", (name,))
-        conn.commit()
-        logging.info(f"Added category: {name}")
-    except sqlite3.IntegrityError: logging.warning(f"Category '{name}' already exists.")
-    finally: conn.close()
+        with _POOL.acquire() as conn:
+            conn.execute("INSERT OR IGNORE INTO categories (name) VALUES (?)", (name,))
+            conn.commit()
+        _invalidate_category_cache()
+        logging.info("Added category: %s", name)
+    except sqlite3.IntegrityError: logging.warning("Category '%s' already exists.", name)
 
 def rename_category(old_name, new_name):
-    conn = get_db_connection()
-    try:
+    with _POOL.acquire() as conn:
         existing = conn.execute("SELECT id FROM categories WHERE LOWER(name) = LOWER(?) AND LOWER(name) != LOWER(?)", (new_name, old_name)).fetchone()
         if existing:
             raise sqlite3.IntegrityError(f"Category '{new_name}' already exists.")
         conn.execute("UPDATE categories SET name = ? WHERE name = ?", (new_name, old_name))
         conn.execute("UPDATE entries SET category = ? WHERE category = ?", (new_name, old_name))
         conn.commit()
-        logging.info(f"Renamed category '{old_name}' to '{new_name}'.")
-    finally: conn.close()
+    _invalidate_category_cache()
+    logging.info("Renamed category '%s' to '%s'.", old_name, new_name)
 
 def delete_category_and_reassign_entries(name):
-    conn = get_db_connection()
+    if name.lower() == "uncategorized": return False
     try:
-        if name.lower() == "uncategorized": return False
-        conn.execute("UPDATE entries SET category = 'Uncategorized' WHERE category = ?", (name,))
-        conn.execute("DELETE FROM categories WHERE name = ?", (name,))
-        conn.commit()
-        logging.info(f"Deleted category '{name}' and reassigned entries.")
+        with _POOL.acquire() as conn:
+            conn.execute("UPDATE entries SET category = 'Uncategorized' WHERE category = ?", (name,))
+            conn.execute("DELETE FROM categories WHERE name = ?", (name,))
+            conn.commit()
+        _invalidate_category_cache()
+        logging.info("Deleted category '%s' and reassigned entries.", name)
         return True
     except Exception as e:
-        logging.error(f"Error deleting category {name}: {e}")
+        logging.error("Error deleting category %s: %s", name, e)
         return False
-    finally: conn.close()
 
 # =============================================================================
 # URL PARSING UTILITY
 # =============================================================================
+_HEX_DIGITS = frozenset('0123456789abcdefABCDEF')
+_MAC_SEPARATOR_POSITIONS = (2, 5, 8, 11, 14)
+
+def is_valid_mac(mac):
+    """True for XX:XX:XX:XX:XX:XX or XX-XX-XX-XX-XX-XX (hex digits, either separator)."""
+    if len(mac) != 17 or any(mac[i] not in ':-' for i in _MAC_SEPARATOR_POSITIONS):
+        return False
+    digits = mac.replace(':', '').replace('-', '')
+    return len(digits) == 12 and _HEX_DIGITS.issuperset(digits)
+_DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+@lru_cache(maxsize=1024)
+def _urlparse(url):
+    # ParseResult is an immutable tuple, so callers can share cached results.
+    return urlparse(url)
+
+@lru_cache(maxsize=512)
+def _server_base_url(scheme, hostname, port):
+    if port and _DEFAULT_PORTS.get(scheme) != port:
+        return f"{scheme}://{hostname}:{port}"
+    return f"{scheme}://{hostname}"
+
+def _extract_credentials(query):
+    """Return (username, password) from a query string, mirroring parse_qs first-value semantics."""
+    username = password = None
+    for pair in query.split('&'):
+        name, sep, value = pair.partition('=')
+        if not sep or not value: continue # parse_qs drops blank values
+        name = unquote_plus(name)
+        if name == 'username' and username is None:
+            username = unquote_plus(value)
+        elif name == 'password' and password is None:
+            password = unquote_plus(value)
+        else:
+            continue
+        if username is not None and password is not None: break
+    return username, password
+
 def parse_get_php_url(url_string):
     details = {'error': None, 'server_base_url': None, 'username': None, 'password': ""}
     try:
-        parsed_url = urlparse(url_string)
-        query_params = parse_qs(parsed_url.query)
+        parsed_url = _urlparse(url_string)
         scheme = parsed_url.scheme; hostname = parsed_url.hostname; port = parsed_url.port
-        username = query_params.get('username', [None])[0]
-        password_list = query_params.get('password', [""]); password = password_list[0] if password_list else ""
+        username, password = _extract_credentials(parsed_url.query)
+        if password is None: password = ""
         if not all([scheme, hostname, username is not None]):
             details['error'] = "Invalid URL: Missing scheme, host, or username parameter."
-            logging.warning(f"URL Parse Error: {details['error']} for URL: {url_string}")
+            logging.warning("URL Parse Error: %s for URL: %s", details['error'], url_string)
             return details
-        server_base_url = f"{scheme}://{hostname}"
-        if port and not ((scheme == 'http' and port == 80) or (scheme == 'https' and port == 443)):
-            server_base_url += f":{port}"
+        server_base_url = _server_base_url(scheme, hostname, port)
         details['server_base_url'] = server_base_url; details['username'] = username; details['password'] = password
-        logging.info(f"Parsed URL: {server_base_url}, User: {username}")
+        logging.info("Parsed URL: %s, User: %s", server_base_url, username)
         return details
     except Exception as e:
-        logging.error(f"Critical failure to parse URL '{url_string}': {e}")
+        logging.error("Critical failure to parse URL '%s': %s", url_string, e)
         details['error'] = f"Critical parsing error: {e}"; return details
 
 # =============================================================================
@@ -366,23 +632,256 @@ def get_safe_api_value(data_dict, key, default=None):
 
 def format_timestamp_display(unix_timestamp_utc):
     if unix_timestamp_utc is None or not isinstance(unix_timestamp_utc, (int, float)) or unix_timestamp_utc <= 0: return "N/A"
-    try:
-        dt_utc = datetime.fromtimestamp(int(unix_timestamp_utc), tz=timezone.utc); dt_local = dt_utc.astimezone(DISPLAY_TZ)
-        return dt_local.strftime('%Y-%m-%d %H:%M %Z')
+    try: return _format_epoch_seconds(int(unix_timestamp_utc))
     except: return "Invalid"
 
+def format_timestamps_bulk(timestamps):
+    """format_timestamp_display over a whole column, formatting each distinct value once."""
+    formatted = {ts: format_timestamp_display(ts) for ts in set(timestamps)}
+    return [formatted[ts] for ts in timestamps]
+
+@lru_cache(maxsize=4096)
+def _format_epoch_seconds(seconds):
+    # Expiry dates repeat heavily across entries, so the strftime result is memoized per second.
+    dt_utc = datetime.fromtimestamp(seconds, tz=timezone.utc); dt_local = dt_utc.astimezone(DISPLAY_TZ)
+    return dt_local.strftime('%Y-%m-%d %H:%M %Z')
+
+@lru_cache(maxsize=16)
 def format_trial_status_display(is_trial):
     if is_trial is None: return "N/A"
     return "Yes" if str(is_trial) == '1' else "No"
 
+def _epg_programme(prog):
+    """(start, stop, name) for one raw EPG programme, or None if it is malformed."""
+    try:
+        if not prog.get('start_timestamp'): return None
+        return int(prog['start_timestamp']), int(prog.get('stop_timestamp') or 0), prog.get('name', '')
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+def epg_schedule(epg_list):
+    """Normalise raw EPG programmes into (starts, stops, names) sorted by start time; bad entries are dropped."""
+    try:
+        # Well-formed replies convert in one pass with no per-programme exception handling
+        progs = [(int(prog['start_timestamp']), int(prog.get('stop_timestamp') or 0), prog.get('name', ''))
+                 for prog in epg_list if prog.get('start_timestamp')]
+    except (TypeError, ValueError, AttributeError, KeyError):
+        progs = [p for p in map(_epg_programme, epg_list) if p is not None]
+    progs.sort(key=lambda p: p[0])
+    return [p[0] for p in progs], [p[1] for p in progs], [p[2] for p in progs]
+
+def current_programme_name(schedule, now):
+    """Name of the programme airing at ``now`` in an epg_schedule() result, or ""."""
+    starts, stops, names = schedule
+    idx = bisect.bisect_right(starts, now) - 1
+    if idx >= 0 and now < stops[idx]: return names[idx]
+    return ""
+
+def format_last_checked_display(last_checked_ts):
+    if not last_checked_ts: return "Never"
+    return _format_local_minute(int(last_checked_ts) // 60)
+
+@lru_cache(maxsize=4096)
+def _format_local_minute(minute):
+    # Shown to the minute, and a flushed batch of checks shares one timestamp, so values repeat a lot.
+    return datetime.fromtimestamp(minute * 60).strftime('%Y-%m-%d %H:%M')
+
 
 # =============================================================================
 # DIALOGS
 # =============================================================================
-class EntryDialog(QDialog):
+class _DeferredCategoriesMixin:
+    """Fills a dialog's category combo on first show (or first read) instead of in __init__."""
+    _categories_populated = False
+
+    def ensure_categories(self):
+        if not self._categories_populated:
+            self._categories_populated = True
+            self.populate_categories()
+
+    def showEvent(self, event):
+        self.ensure_categories()
+        super().showEvent(event)
+
+class EntrySaveWorker(QObject):
+    """Runs add_entry/update_entry for EntryDialog off the GUI thread."""
+    saved = Signal(int) # entry id
+    error_occurred = Signal(str)
+    finished = Signal()
+
+    def __init__(self, entry_id, data):
+        super().__init__()
+        self.entry_id = entry_id
+        self.data = data
+
+    @Slot()
+    def run(self):
+        data = self.data
+        try:
+            if self.entry_id is not None:
+                update_entry(self.entry_id, data['name'], data['category'],
+                             data['server_url'], data['username'], data['password'],
+                             data['account_type'], data['mac_address'], data['portal_url'])
+                saved_id = self.entry_id
+            else:
+                saved_id = add_entry(data['name'], data['category'],
+                                     data['server_url'], data['username'], data['password'],
+                                     data['account_type'], data['mac_address'], data['portal_url'])
+            self.saved.emit(saved_id)
+        except Exception as e:
+            logging.error("Error saving entry: %s", e)
+            self.error_occurred.emit(str(e))
+        finally:
+            self.finished.emit()
+
+# Line markers recognised by ImportWorker
+IMPORT_STALKER_PREFIX = "stalker_portal:"
+IMPORT_MAC_PREFIX = "mac:"
+IMPORT_XC_MARKER = "get.php?"
+HTTP_PREFIXES = ("http://", "https://")
+IMPORT_BATCH_SIZE = 500 # Lines per insert transaction and progress update
+
+class ImportWorker(QObject):
+    """Parses a batch-import text file and inserts its entries off the GUI thread."""
+    progress = Signal(int, int) # bytes read, file size
+    imported = Signal(int, int) # imported, failed/skipped
+    error_occurred = Signal(str)
+    finished = Signal()
+
+    def __init__(self, file_path, default_category):
+        super().__init__()
+        self.file_path = file_path
+        self.default_category = default_category
+        self._stopped = False
+
+    def stop(self):
+        self._stopped = True
+
+    @Slot()
+    def run(self):
+        default_category = self.default_category
+        imported_count = 0
+        failed_count = 0
+
+        current_stalker_portal_url_for_mac_list = None
+        pending = [] # add_entries_bulk() rows, written every IMPORT_BATCH_SIZE lines
+
+        def flush():
+            nonlocal imported_count, failed_count
+            if not pending: return
+            try:
+                add_entries_bulk(pending); imported_count += len(pending)
+            except Exception as db_e:
+                # One bad row fails the whole transaction; retry row by row so only that one is lost
+                logging.warning("Batch Import: Bulk insert of %s entries failed (%s), retrying one at a time.", len(pending), db_e)
+                for name, category, server_url, username, password, account_type, mac_address, portal_url in pending:
+                    try:
+                        add_entry(name, category, server_url, username, password, account_type, mac_address, portal_url)
+                        imported_count += 1
+                    except Exception as row_e: logging.error("Batch Import: DB error for entry '%s': %s", name, row_e); failed_count += 1
+            pending.clear()
+
+        try:
+            with open(self.file_path, 'rb') as f:
+                total_bytes = os.fstat(f.fileno()).st_size
+                bytes_read = 0
+                for line_num, raw_line in enumerate(f, 1):
+                    bytes_read += len(raw_line)
+                    if line_num % IMPORT_BATCH_SIZE == 0:
+                        flush()
+                        self.progress.emit(bytes_read, total_bytes)
+                        if self._stopped: break
+                    line_content = raw_line.decode('utf-8', errors='ignore').strip()
+                    if not line_content or line_content.startswith('#'):
+                        continue
+
+                    is_stalker_credential_string = line_content.startswith(IMPORT_STALKER_PREFIX)
+                    is_xc_link = IMPORT_XC_MARKER in line_content
+                    # A line is a potential portal URL if it starts with http/https, is NOT an XC link, AND NOT a stalker credential string
+                    is_potential_portal_url = line_content.startswith(HTTP_PREFIXES) and not is_xc_link and not is_stalker_credential_string
+                    # Only lines none of the cheaper tests claimed can be a bare MAC
+                    is_potential_mac = not (is_stalker_credential_string or is_xc_link or is_potential_portal_url) \
+                                       and is_valid_mac(line_content)
+
+                    if is_stalker_credential_string:
+                        current_stalker_portal_url_for_mac_list = None # Reset context
+                        try:
+                            parts = line_content.split(',')
+                            if len(parts) < 2: raise ValueError("Malformed stalker string, missing comma.")
+                            portal_part_full = parts[0].strip()
+                            mac_part_full = parts[1].strip()
+
+                            if not portal_part_full.startswith(IMPORT_STALKER_PREFIX) or not mac_part_full.startswith(IMPORT_MAC_PREFIX):
+                                raise ValueError("Malformed stalker string, missing prefixes.")
+
+                            portal_url = portal_part_full.replace(IMPORT_STALKER_PREFIX, "").strip()
+                            mac_address = mac_part_full.replace(IMPORT_MAC_PREFIX, "").strip().upper()
+
+                            if not portal_url.startswith(HTTP_PREFIXES):
+                                logging.warning("Batch Import: Invalid Stalker portal URL in string on line %s: %s", line_num, portal_url); failed_count += 1; continue
+                            if not is_valid_mac(mac_address): # Re-check MAC after parsing
+                                logging.warning("Batch Import: Invalid Stalker MAC address in string on line %s: %s", line_num, mac_address); failed_count += 1; continue
+
+                            parsed_p_url = _urlparse(portal_url)
+                            host = parsed_p_url.hostname or "stalker_host"
+                            display_name = f"{host}_{mac_address.replace(':', '')}_L{line_num}"
+                            server_base_url = f"{parsed_p_url.scheme}://{parsed_p_url.netloc}" if parsed_p_url.scheme and parsed_p_url.netloc else portal_url
+                            pending.append((display_name, default_category, server_base_url, "", "", 'stalker', mac_address, portal_url))
+                            logging.info("Batch Import: Parsed Stalker credential string from line %s", line_num)
+                        except Exception as e_stalker_str:
+                            logging.error("Batch Import: Error processing Stalker credential string on line %s ('%s'): %s", line_num, line_content, e_stalker_str); failed_count += 1
+
+                    elif is_xc_link:
+                        current_stalker_portal_url_for_mac_list = None # Reset context
+                        parsed_info = parse_get_php_url(line_content)
+                        if parsed_info and not parsed_info.get('error'):
+                            host = _urlparse(parsed_info['server_base_url']).hostname or "host"
+                            display_name = f"{host}_{parsed_info['username']}_L{line_num}"
+                            pending.append((display_name, default_category, parsed_info['server_base_url'], parsed_info['username'], parsed_info['password'], 'xc', None, None))
+                        else:
+                            logging.warning("Batch Import: Failed to parse XC URL on line %s: %s - %s", line_num, line_content, parsed_info.get('error', 'Unknown') if parsed_info else 'None'); failed_count += 1
+
+                    elif is_potential_portal_url: # Must be checked AFTER specific formats (XC, stalker_portal:)
+                        parsed_val_url = _urlparse(line_content)
+                        if parsed_val_url.scheme and parsed_val_url.netloc: # Basic validation
+                            current_stalker_portal_url_for_mac_list = line_content
+                            logging.info("Batch Import: Set current Stalker portal URL for subsequent MACs to: %s (from line %s)", current_stalker_portal_url_for_mac_list, line_num)
+                        else:
+                            logging.warning("Batch Import: Skipped potential URL (malformed or unsupported) on line %s: %s", line_num, line_content)
+                            # current_stalker_portal_url_for_mac_list = None # Keep previous context or reset? Let's keep for now.
+                            failed_count +=1
+
+                    elif is_potential_mac and current_stalker_portal_url_for_mac_list:
+                        mac_address = line_content.strip().upper() # Already validated by is_potential_mac basically
+                        portal_url = current_stalker_portal_url_for_mac_list
+                        try:
+                            parsed_p_url = _urlparse(portal_url)
+                            host = parsed_p_url.hostname or "stalker_host"
+                            display_name = f"{host}_{mac_address.replace(':', '')}_L{line_num}"
+                            server_base_url = f"{parsed_p_url.scheme}://{parsed_p_url.netloc}" if parsed_p_url.scheme and parsed_p_url.netloc else portal_url
+                            pending.append((display_name, default_category, server_base_url, "", "", 'stalker', mac_address, portal_url))
+                            logging.info("Batch Import: Parsed Stalker MAC %s for portal %s from line %s", mac_address, portal_url, line_num)
+                        except Exception as e_mac_list:
+                            logging.error("Batch Import: Error processing MAC %s for portal %s on line %s: %s", mac_address, portal_url, line_num, e_mac_list); failed_count += 1
+
+                    else:
+                        if is_potential_mac and not current_stalker_portal_url_for_mac_list:
+                            logging.warning("Batch Import: Skipped MAC address %s on line %s as no Stalker Portal URL was previously defined in a block.", line_content, line_num)
+                        else:
+                            logging.warning("Batch Import: Skipped unrecognized line %s: %s...", line_num, line_content[:100])
+                        failed_count += 1
+
+            flush()
+            self.imported.emit(imported_count, failed_count)
+        except IOError as e: logging.error("Error reading import file '%s': %s", self.file_path, e); self.error_occurred.emit(f"Could not read file: {e}")
+        except Exception as e_gen: logging.error("Unexpected error during batch import: %s", e_gen); self.error_occurred.emit(f"Unexpected error: {e_gen}")
+        finally:
+            self.finished.emit()
+
+class EntryDialog(_DeferredCategoriesMixin, QDialog):
     def __init__(self, entry_id=None, parent=None):
-        super().__init__(parent); self.entry_id = entry_id; self.is_edit_mode = entry_id is not None
-        self.setWindowTitle(f"{'Edit' if self.is_edit_mode else 'Add'} IPTV Entry")
+        super().__init__(parent)
+        self.save_thread = None; self.save_worker = None
         self.setMinimumWidth(600)
         self.setWindowModality(Qt.WindowModal)
 
@@ -400,11 +899,9 @@ class EntryDialog(QDialog):
 
         self.name_edit = QLineEdit()
         self.category_combo = QComboBox()
-        self.populate_categories()
 
         self.account_type_combo = QComboBox()
         self.account_type_combo.addItems(["Xtream Codes API", "Stalker Portal"])
-        self.account_type_combo.currentTextChanged.connect(self.toggle_input_fields)
 
         # XC API Fields
         self.server_url_label = QLabel("Server URL (e.g., http://domain:port):")
@@ -433,6 +930,12 @@ class EntryDialog(QDialog):
         self.mac_address_label = QLabel("MAC Address (XX:XX:XX:XX:XX:XX):")
         self.mac_address_edit = QLineEdit()
 
+        # Shown/hidden as a group by toggle_input_fields
+        self._xc_widgets = (self.server_url_label, self.server_url_edit, self.username_label,
+                            self.username_edit, self.password_label, self.password_container)
+        self._stalker_widgets = (self.portal_url_label, self.portal_url_edit,
+                                 self.mac_address_label, self.mac_address_edit)
+
         # Add widgets to Grid Layout
         row = 0
         grid_layout.addWidget(QLabel("Display Name:"), row, 0)
@@ -477,11 +980,27 @@ class EntryDialog(QDialog):
         self.button_box.rejected.connect(self.reject)
         layout.addWidget(self.button_box)
 
+        self.reset(entry_id)
+        self.account_type_combo.currentTextChanged.connect(self.toggle_input_fields)
+
+    def reset(self, entry_id=None):
+        """Point the dialog at another entry (or a blank Add form) so one instance can be reused."""
+        self.entry_id = entry_id; self.is_edit_mode = entry_id is not None
+        self._original_entry = None # Row as loaded, for cache invalidation after an edit
+        self._categories_populated = False # Categories may have changed since the last open
+        self.setWindowTitle(f"{'Edit' if self.is_edit_mode else 'Add'} IPTV Entry")
+        for edit in (self.name_edit, self.server_url_edit, self.username_edit, self.password_edit,
+                     self.portal_url_edit, self.mac_address_edit):
+            edit.clear()
+        self.show_password_cb.setChecked(False)
+        self.button_box.setEnabled(True)
+        self.account_type_combo.blockSignals(True); self.account_type_combo.setCurrentIndex(0); self.account_type_combo.blockSignals(False)
+        self.category_combo.setCurrentIndex(0) # Same as a fresh dialog; setModel() won't reset a reused model
+
         if self.is_edit_mode:
             self.load_entry_data()
-        else:
-            self.toggle_input_fields(self.account_type_combo.currentText()) # Initial field visibility
-
+        # Set visibility once for the loaded (or default) type; the combo signal handles user changes.
+        self.toggle_input_fields(self.account_type_combo.currentText())
         self.name_edit.setFocus()
 
     def toggle_password_visibility(self, checked):
@@ -492,36 +1011,29 @@ class EntryDialog(QDialog):
 
     def toggle_input_fields(self, account_type_text):
         is_stalker = account_type_text == "Stalker Portal"
-
-        # XC Fields
-        self.server_url_label.setVisible(not is_stalker)
-        self.server_url_edit.setVisible(not is_stalker)
-        self.username_label.setVisible(not is_stalker)
-        self.username_edit.setVisible(not is_stalker)
-        self.password_label.setVisible(not is_stalker)
-        self.password_container.setVisible(not is_stalker)
-
-        # Stalker Fields
-        self.portal_url_label.setVisible(is_stalker)
-        self.portal_url_edit.setVisible(is_stalker)
-        self.mac_address_label.setVisible(is_stalker)
-        self.mac_address_edit.setVisible(is_stalker)
+        self.setUpdatesEnabled(False) # One repaint for the whole swap
+        try:
+            for widget in self._xc_widgets: widget.setVisible(not is_stalker)
+            for widget in self._stalker_widgets: widget.setVisible(is_stalker)
+        finally:
+            self.setUpdatesEnabled(True)
 
     def populate_categories(self):
-        self.category_combo.clear();
-        try: cats = get_all_categories(); self.category_combo.addItems(cats if cats else ["Uncategorized"])
-        except Exception as e: logging.error(f"Failed to populate categories: {e}"); self.category_combo.addItem("Uncategorized")
+        try: self.category_combo.setModel(category_model())
+        except Exception as e: logging.error("Failed to populate categories: %s", e); self.category_combo.addItem("Uncategorized")
 
     def load_entry_data(self):
         try:
             entry = get_entry_by_id(self.entry_id)
             if entry:
+                self._original_entry = entry
                 self.name_edit.setText(entry['name'])
                 # entry is an sqlite3.Row object.
                 current_account_type = entry['account_type'] if entry['account_type'] is not None else 'xc'
                 type_display_name = "Stalker Portal" if current_account_type == 'stalker' else "Xtream Codes API"
+                self.account_type_combo.blockSignals(True) # Visibility is applied once by the caller
                 self.account_type_combo.setCurrentText(type_display_name)
-                self.toggle_input_fields(type_display_name) # Ensure fields are visible before setting text
+                self.account_type_combo.blockSignals(False)
 
                 if current_account_type == 'stalker':
                     self.portal_url_edit.setText(entry['portal_url'] or "")
@@ -538,13 +1050,19 @@ class EntryDialog(QDialog):
                     self.portal_url_edit.setText("")
                     self.mac_address_edit.setText("")
 
+                self.ensure_categories()
                 idx = self.category_combo.findText(entry['category'])
                 if idx != -1: self.category_combo.setCurrentIndex(idx)
-                else: self.category_combo.addItem(entry['category']); self.category_combo.setCurrentText(entry['category'])
+                else:
+                    # Unknown category: give this combo a private list rather than editing the shared model.
+                    names = self.category_combo.model().stringList() if isinstance(self.category_combo.model(), QStringListModel) else []
+                    self.category_combo.setModel(QStringListModel(names + [entry['category']], self.category_combo))
+                    self.category_combo.setCurrentText(entry['category'])
             else: QMessageBox.warning(self, "Error", "Could not load entry data."); self.reject()
-        except Exception as e: logging.error(f"Error loading entry ID {self.entry_id}: {e}"); QMessageBox.critical(self, "Load Error", f"Failed to load: {e}"); self.reject()
+        except Exception as e: logging.error("Error loading entry ID %s: %s", self.entry_id, e); QMessageBox.critical(self, "Load Error", f"Failed to load: {e}"); self.reject()
 
     def get_data(self):
+        self.ensure_categories()
         data = {
             "name": self.name_edit.text().strip(),
             "category": self.category_combo.currentText(),
@@ -557,7 +1075,7 @@ class EntryDialog(QDialog):
             # For Stalker, server_base_url might be derived from portal_url or set to portal_url itself
             # Let's use portal_url for server_base_url for now, can be refined.
             # Username/password are not used for Stalker in this context
-            parsed_portal = urlparse(data["portal_url"])
+            parsed_portal = _urlparse(data["portal_url"])
             data["server_url"] = f"{parsed_portal.scheme}://{parsed_portal.netloc}" if parsed_portal.scheme and parsed_portal.netloc else data["portal_url"]
             data["username"] = "" # Not applicable
             data["password"] = "" # Not applicable
@@ -594,22 +1112,43 @@ class EntryDialog(QDialog):
                 QMessageBox.warning(self, "Input Error", "Portal URL must start with http:// or https://.")
                 return
 
-            mac_pattern = re.compile(r"^([0-9A-Fa-f]{2}[:-]){5}([0-9A-Fa-f]{2})$")
-            if not mac_pattern.match(data['mac_address']):
+            if not is_valid_mac(data['mac_address']):
                  QMessageBox.warning(self, "Input Error", "MAC Address must be in the format XX:XX:XX:XX:XX:XX or XX-XX-XX-XX-XX-XX.")
                  return
 
-        try:
-            if self.is_edit_mode:
-                update_entry(self.entry_id, data['name'], data['category'],
-                             data['server_url'], data['username'], data['password'],
-                             data['account_type'], data['mac_address'], data['portal_url'])
-            else:
-                add_entry(data['name'], data['category'],
-                          data['server_url'], data['username'], data['password'],
-                          data['account_type'], data['mac_address'], data['portal_url'])
-            self.accept()
-        except Exception as e: logging.error(f"Error saving entry: {e}"); QMessageBox.critical(self, "Database Error", f"Could not save: {e}")
+        # Save on a worker thread; the dialog closes once the write has succeeded.
+        self.button_box.setEnabled(False)
+        self.save_worker = EntrySaveWorker(self.entry_id if self.is_edit_mode else None, data)
+        self.save_thread = QThread()
+        self.save_worker.moveToThread(self.save_thread)
+        self.save_thread.started.connect(self.save_worker.run)
+        self.save_worker.saved.connect(self.on_entry_saved)
+        self.save_worker.error_occurred.connect(self.on_save_error)
+        self.save_worker.finished.connect(self.save_thread.quit)
+        self.save_worker.finished.connect(self.save_worker.deleteLater)
+        self.save_thread.start()
+
+    def _finish_save_thread(self):
+        if self.save_thread:
+            self.save_thread.quit(); self.save_thread.wait()
+            self.save_thread = None
+
+    @Slot(int)
+    def on_entry_saved(self, entry_id):
+        self._finish_save_thread()
+        if self._original_entry is not None:
+            invalidate_entry_caches(self._original_entry, self.get_data())
+        self.accept()
+
+    @Slot(str)
+    def on_save_error(self, error_message):
+        self._finish_save_thread()
+        self.button_box.setEnabled(True)
+        QMessageBox.critical(self, "Database Error", f"Could not save: {error_message}")
+
+    def reject(self):
+        if self.save_thread: return # Ignore Esc/close while a save is in flight
+        super().reject()
 
 class ManageCategoriesDialog(QDialog):
     def __init__(self, parent=None):
@@ -623,13 +1162,16 @@ class ManageCategoriesDialog(QDialog):
         self.delete_button.clicked.connect(self.delete_category_action); self.close_button.clicked.connect(self.accept)
         self.refresh_categories_list(); self.category_list_widget.itemSelectionChanged.connect(self.update_button_states); self.update_button_states()
     def refresh_categories_list(self):
-        self.category_list_widget.clear()
+        list_widget = self.category_list_widget
+        list_widget.setUpdatesEnabled(False); list_widget.blockSignals(True)
         try:
-            for cat_name in get_all_categories():
-                item = QListWidgetItem(cat_name)
-                if cat_name.lower() == "uncategorized": item.setFlags(item.flags() & ~(Qt.ItemIsSelectable | Qt.ItemIsEditable)); item.setForeground(QColor("gray"))
-                self.category_list_widget.addItem(item)
-        except Exception as e: logging.error(f"Failed to refresh categories in dialog: {e}")
+            list_widget.clear()
+            list_widget.addItems(get_all_categories_cached())
+            # MatchFixedString is case-insensitive, matching the lower() check used elsewhere.
+            for item in list_widget.findItems("Uncategorized", Qt.MatchFixedString):
+                item.setFlags(item.flags() & ~(Qt.ItemIsSelectable | Qt.ItemIsEditable)); item.setForeground(QColor("gray"))
+        except Exception as e: logging.error("Failed to refresh categories in dialog: %s", e)
+        finally: list_widget.blockSignals(False); list_widget.setUpdatesEnabled(True)
         self.update_button_states()
     def update_button_states(self):
         sel = self.category_list_widget.currentItem(); is_sel = sel is not None; is_uncat = is_sel and sel.text().lower() == "uncategorized"
@@ -666,23 +1208,24 @@ class ManageCategoriesDialog(QDialog):
             if delete_category_and_reassign_entries(name_del): self.refresh_categories_list()
             else: QMessageBox.warning(self, "Delete Error", f"Could not delete '{name_del}'.")
 
-class ImportUrlDialog(QDialog):
+class ImportUrlDialog(_DeferredCategoriesMixin, QDialog):
     def __init__(self, parent=None):
         super().__init__(parent); self.setWindowTitle("Import Entry from URL"); self.setMinimumWidth(500); self.setWindowModality(Qt.WindowModal)
         layout = QVBoxLayout(self); form_layout = QFormLayout(); self.url_edit = QLineEdit(); self.url_edit.setPlaceholderText("http://server:port/get.php?username=...")
-        self.name_edit = QLineEdit(); self.name_edit.setPlaceholderText("Optional: Auto-generated if blank"); self.category_combo = QComboBox(); self.populate_categories()
+        self.name_edit = QLineEdit(); self.name_edit.setPlaceholderText("Optional: Auto-generated if blank"); self.category_combo = QComboBox()
         form_layout.addRow("M3U Get Link URL:", self.url_edit); form_layout.addRow("Display Name (Optional):", self.name_edit); form_layout.addRow("Category:", self.category_combo)
         layout.addLayout(form_layout); self.button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
         self.button_box.accepted.connect(self.accept_dialog); self.button_box.rejected.connect(self.reject); layout.addWidget(self.button_box); self.url_edit.setFocus()
 
     def populate_categories(self):
-        self.category_combo.clear()
         try:
-            cats = get_all_categories(); self.category_combo.addItems(cats if cats else ["Uncategorized"]); uncat_idx = self.category_combo.findText("Uncategorized")
+            self.category_combo.setModel(category_model()); uncat_idx = self.category_combo.findText("Uncategorized")
             if uncat_idx != -1: self.category_combo.setCurrentIndex(uncat_idx)
-        except Exception as e: logging.error(f"ImportUrlDialog: Failed to populate categories: {e}"); self.category_combo.addItem("Uncategorized")
+        except Exception as e: logging.error("ImportUrlDialog: Failed to populate categories: %s", e); self.category_combo.addItem("Uncategorized")
 
-    def get_data(self): return {"url": self.url_edit.text().strip(), "name": self.name_edit.text().strip(), "category": self.category_combo.currentText()}
+    def get_data(self):
+        self.ensure_categories()
+        return {"url": self.url_edit.text().strip(), "name": self.name_edit.text().strip(), "category": self.category_combo.currentText()}
 
     @Slot()
     def accept_dialog(self):
@@ -700,13 +1243,14 @@ class ImportUrlDialog(QDialog):
         display_name = data['name']
         if not display_name:
             try:
-                host = urlparse(parsed['server_base_url']).hostname or "host"
+                host = _urlparse(parsed['server_base_url']).hostname or "host"
                 display_name = f"{host}_{parsed['username']}"
             except Exception as e:
                 logging.warning(
-                    f"Error auto-generating display name for URL '{data['url']}': {e}. "
-                    f"Details - Parsed server: '{parsed.get('server_base_url', 'N/A')}', "
-                    f"Parsed user: '{parsed.get('username', 'N/A')}'. Using fallback name."
+                    "Error auto-generating display name for URL '%s': %s. "
+                    "Details - Parsed server: '%s', "
+                    "Parsed user: '%s'. Using fallback name.",
+                    data['url'], e, parsed.get('server_base_url', 'N/A'), parsed.get('username', 'N/A')
                 )
                 username_for_fallback = str(parsed.get('username', ''))
                 display_name = f"Imported_{username_for_fallback}"
@@ -716,24 +1260,23 @@ class ImportUrlDialog(QDialog):
             QMessageBox.information(self, "Success", f"Entry '{display_name}' imported.")
             self.accept()
         except Exception as e:
-            logging.error(f"Error adding imported entry: {e}")
+            logging.error("Error adding imported entry: %s", e)
             QMessageBox.critical(self, "Database Error", f"Could not save imported entry: {e}")
 
-class BatchImportOptionsDialog(QDialog):
+class BatchImportOptionsDialog(_DeferredCategoriesMixin, QDialog):
     def __init__(self, parent=None):
         super().__init__(parent); self.setWindowTitle("Batch Import Options"); self.setWindowModality(Qt.WindowModal)
-        layout = QVBoxLayout(self); form_layout = QFormLayout(); self.category_combo = QComboBox(); self.populate_categories()
+        layout = QVBoxLayout(self); form_layout = QFormLayout(); self.category_combo = QComboBox()
         form_layout.addRow("Assign to Category:", self.category_combo); layout.addLayout(form_layout); self.button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
         self.button_box.accepted.connect(self.accept); self.button_box.rejected.connect(self.reject); layout.addWidget(self.button_box)
     def populate_categories(self):
-        self.category_combo.clear()
         try:
-            cats = get_all_categories(); self.category_combo.addItems(cats if cats else ["Uncategorized"]); uncat_idx = self.category_combo.findText("Uncategorized")
+            self.category_combo.setModel(category_model()); uncat_idx = self.category_combo.findText("Uncategorized")
             if uncat_idx != -1: self.category_combo.setCurrentIndex(uncat_idx)
-        except Exception as e: logging.error(f"BatchImportOptionsDialog: Failed to populate categories: {e}"); self.category_combo.addItem("Uncategorized")
-    def get_selected_category(self): return self.category_combo.currentText()
+        except Exception as e: logging.error("BatchImportOptionsDialog: Failed to populate categories: %s", e); self.category_combo.addItem("Uncategorized")
+    def get_selected_category(self): self.ensure_categories(); return self.category_combo.currentText()
 
-class BulkEditCategoryDialog(QDialog):
+class BulkEditCategoryDialog(_DeferredCategoriesMixin, QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Bulk Edit Category")
@@ -744,7 +1287,6 @@ class BulkEditCategoryDialog(QDialog):
         form_layout = QFormLayout()
 
         self.category_combo = QComboBox()
-        self.populate_categories()
 
         form_layout.addRow("Assign to Category:", self.category_combo)
         layout.addLayout(form_layout)
@@ -755,21 +1297,85 @@ class BulkEditCategoryDialog(QDialog):
         layout.addWidget(self.button_box)
 
     def populate_categories(self):
-        self.category_combo.clear()
         try:
-            cats = get_all_categories()
-            self.category_combo.addItems(cats if cats else ["Uncategorized"])
+            self.category_combo.setModel(category_model())
             uncat_idx = self.category_combo.findText("Uncategorized")
             if uncat_idx != -1:
                 self.category_combo.setCurrentIndex(uncat_idx)
         except Exception as e:
-            logging.error(f"BulkEditCategoryDialog: Failed to populate categories: {e}")
+            logging.error("BulkEditCategoryDialog: Failed to populate categories: %s", e)
             self.category_combo.addItem("Uncategorized")
 
     def get_selected_category(self):
+        self.ensure_categories()
         return self.category_combo.currentText()
 
 
+class _PortalSlot:
+    """One cached portal session plus the lock its users take turns on."""
+    __slots__ = ('lock', 'portal', 'handshake_at')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.portal = None
+        self.handshake_at = 0.0
+
+# (portal_url, mac_address) -> _PortalSlot
+_PORTAL_CACHE = {}
+_PORTAL_CACHE_LOCK = threading.Lock()
+
+@contextmanager
+def _locked_portal(entry_data):
+    """Authenticated StalkerPortal for an entry, reusing a recent handshake when there is one.
+
+    A StalkerPortal's session, token and profile are not thread-safe, so the portal is held
+    exclusively for the with block; workers for the same account wait their turn, and two
+    that miss the cache together handshake only once.
+    """
+    key = (entry_data['portal_url'], entry_data['mac_address'])
+    with _PORTAL_CACHE_LOCK:
+        slot = _PORTAL_CACHE.get(key)
+        if slot is None:
+            slot = _PORTAL_CACHE[key] = _PortalSlot()
+    with slot.lock:
+        if slot.portal is None or time.monotonic() - slot.handshake_at >= STALKER_PORTAL_CACHE_TTL:
+            portal = StalkerPortal(*key)
+            if not portal.handshake(): # Profile is fetched by the portal on its first API call
+                raise Exception("Handshake failed")
+            slot.portal, slot.handshake_at = portal, time.monotonic()
+        yield slot.portal
+
+def invalidate_portal_cache(portal_url, mac_address):
+    with _PORTAL_CACHE_LOCK:
+        _PORTAL_CACHE.pop((portal_url, mac_address), None)
+
+def _forget_portal(entry_data):
+    """Drop a cached portal after a failure so the next worker handshakes again."""
+    invalidate_portal_cache(entry_data['portal_url'], entry_data['mac_address'])
+
+def invalidate_entry_caches(old_entry, new_data=None):
+    """Drop the cached connection state an edited or deleted entry was using.
+
+    ``old_entry`` is the row as it was; ``new_data`` is EntryDialog.get_data() after an edit.
+    Only this entry's portal is dropped. XC sessions hold no credentials and may be shared
+    by other entries, so one is only dropped when the entry moves to another server.
+    """
+    if old_entry['account_type'] == 'stalker':
+        invalidate_portal_cache(old_entry['portal_url'], old_entry['mac_address'])
+    elif new_data is not None and _session_key(new_data['server_url']) != _session_key(old_entry['server_base_url']):
+        invalidate_session_cache(old_entry['server_base_url'])
+
+class _CancellableWorker:
+    """Cooperative cancellation for the playlist loader workers.
+
+    The dialog calls cancel() and moves on instead of blocking on QThread.wait(); the worker
+    lets its request finish in the background and drops the result.
+    """
+    _cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
 class StalkerCategoryLoaderWorker(QObject):
     data_ready = Signal(dict)
     error_occurred = Signal(str)
@@ -782,39 +1388,27 @@ class StalkerCategoryLoaderWorker(QObject):
     @Slot()
     def run(self):
         try:
-            portal = StalkerPortal(
-                self.entry_data['portal_url'],
-                self.entry_data['mac_address']
-            )
-            if not portal.handshake():
-                 raise Exception("Handshake failed")
-
-            portal.get_profile()
-
-            data = {
-                'live': portal.get_categories("itv"),
-                'movie': portal.get_categories("vod"),
-                'series': portal.get_categories("series")
-            }
-
-            final_data = {'live': [], 'movie': [], 'series': []}
+            with _locked_portal(self.entry_data) as portal:
+                data = {
+                    'live': portal.get_categories("itv"),
+                    'movie': portal.get_categories("vod"),
+                    'series': portal.get_categories("series")
+                }
 
-            for k, v in data.items():
-                if isinstance(v, list):
-                    for item in v:
-                        if isinstance(item, dict):
-                            final_data[k].append({
-                                'category_id': str(item.get('id', '')),
-                                'category_name': str(item.get('title', 'Unknown'))
-                            })
+            final_data = {
+                k: [{'category_id': str(item.get('id', '')), 'category_name': str(item.get('title', 'Unknown'))}
+                    for item in v if isinstance(item, dict)] if isinstance(v, list) else []
+                for k, v in data.items()
+            }
 
             self.data_ready.emit(final_data)
         except Exception as e:
+            _forget_portal(self.entry_data)
             self.error_occurred.emit(str(e))
         finally:
             self.finished.emit()
 
-class StalkerStreamLoaderWorker(QObject):
+class StalkerStreamLoaderWorker(_CancellableWorker, QObject):
     data_ready = Signal(list)
     error_occurred = Signal(str)
     finished = Signal()
@@ -828,52 +1422,30 @@ class StalkerStreamLoaderWorker(QObject):
     @Slot()
     def run(self):
         try:
-            portal = StalkerPortal(
-                self.entry_data['portal_url'],
-                self.entry_data['mac_address']
-            )
-            if not portal.handshake():
-                 raise Exception("Handshake failed")
-            portal.get_profile()
-
             stalker_type = "itv" if self.stream_type == 'live' else "vod" if self.stream_type == 'movie' else "series"
-            streams = portal.get_streams(stalker_type, self.category_id)
-
-            mapped_streams = []
-            for s in streams:
-                if not isinstance(s, dict): continue
-
-                # Use 'cmd' as ID if available for Live/VOD, use 'id' for Series navigation
-                if stalker_type == 'series':
-                    s_id = str(s.get('id', ''))
-                else:
-                    s_id = str(s.get('cmd', '') or s.get('id', ''))
-
-                name_val = str(s.get('name', '') or s.get('title', 'Unknown'))
-                num_id = str(s.get('id', ''))
-                cmd_val = str(s.get('cmd', ''))
-
-                stream_entry = {
-                    'name': name_val,
-                    'stream_id': s_id,
-                    'container_extension': 'ts' if stalker_type == 'itv' else 'mp4',
-                    'cmd': cmd_val
+            with _locked_portal(self.entry_data) as portal:
+                streams = portal.get_streams(stalker_type, self.category_id)
+
+            is_series = stalker_type == 'series'
+            is_itv = stalker_type == 'itv'
+            ext = 'ts' if is_itv else 'mp4'
+            # Use 'cmd' as ID if available for Live/VOD, use 'id' for Series navigation
+            mapped_streams = [
+                {
+                    'name': str(s.get('name', '') or s.get('title', 'Unknown')),
+                    'stream_id': str(s.get('id', '')) if is_series else str(s.get('cmd', '') or s.get('id', '')),
+                    'container_extension': ext,
+                    'cmd': str(s.get('cmd', '')),
+                    'series_id': str(s.get('id', '')) if is_series else None,
+                    'epg_id': str(s.get('id', '')) if is_itv else None,
                 }
+                for s in streams if isinstance(s, dict)
+            ]
 
-                if stalker_type == 'series':
-                    stream_entry['series_id'] = num_id
-                else:
-                    stream_entry['series_id'] = None
-
-                if stalker_type == 'itv':
-                    stream_entry['epg_id'] = num_id
-                else:
-                    stream_entry['epg_id'] = None
-
-                mapped_streams.append(stream_entry)
-
-            self.data_ready.emit(mapped_streams)
+            if not self._cancelled:
+                self.data_ready.emit(mapped_streams)
         except Exception as e:
+            _forget_portal(self.entry_data)
             self.error_occurred.emit(str(e))
         finally:
             self.finished.emit()
@@ -892,28 +1464,22 @@ class StalkerPlaybackWorker(QObject):
     @Slot()
     def run(self):
         try:
-            portal = StalkerPortal(
-                self.entry_data['portal_url'],
-                self.entry_data['mac_address']
-            )
-            if not portal.handshake():
-                 raise Exception("Handshake failed")
-            portal.get_profile()
-
             stalker_type = "itv" if self.stream_type == 'live' else "vod"
             # stream_id passed here is the 'cmd' string for Live TV, or ID/cmd for VOD.
 
-            real_url = portal.create_link(stalker_type, self.stream_id)
-            cookies = portal.get_cookie_string()
+            with _locked_portal(self.entry_data) as portal:
+                real_url = portal.create_link(stalker_type, self.stream_id)
+                cookies = portal.get_cookie_string()
 
             self.link_ready.emit(str(real_url), str(cookies))
 
         except Exception as e:
+            _forget_portal(self.entry_data)
             self.error_occurred.emit(str(e))
         finally:
              self.finished.emit()
 
-class StalkerSeriesInfoWorker(QObject):
+class StalkerSeriesInfoWorker(_CancellableWorker, QObject):
     data_ready = Signal(object)
     error_occurred = Signal(str)
     finished = Signal()
@@ -926,33 +1492,88 @@ class StalkerSeriesInfoWorker(QObject):
     @Slot()
     def run(self):
         try:
-            portal = StalkerPortal(
-                self.entry_data['portal_url'],
-                self.entry_data['mac_address']
-            )
-            if not portal.handshake(): raise Exception("Handshake failed")
-            portal.get_profile()
-
-            episodes = portal.get_series_episodes(self.series_id)
-
-            mapped_episodes = []
-            for ep in episodes:
-                if not isinstance(ep, dict): continue
-                mapped_episodes.append({
+            with _locked_portal(self.entry_data) as portal:
+                episodes = portal.get_series_episodes(self.series_id)
+
+            mapped_episodes = [
+                {
                     'title': str(ep.get('name') or ep.get('title') or 'Unknown'),
                     'id': str(ep.get('cmd') or ep.get('id') or ''),
                     'season': int(ep.get('season_num', 0)),
                     'episode_num': int(ep.get('episode_number', 0)),
                     'container_extension': 'mp4'
-                })
+                }
+                for ep in episodes if isinstance(ep, dict)
+            ]
 
-            self.data_ready.emit({'info': {'name': 'Series'}, 'episodes': mapped_episodes})
+            if not self._cancelled:
+                self.data_ready.emit({'info': {'name': 'Series'}, 'episodes': mapped_episodes})
 
         except Exception as e:
+            _forget_portal(self.entry_data)
             self.error_occurred.emit(str(e))
         finally:
             self.finished.emit()
 
+# _session_key(server_base_url) -> requests.Session, so browsing one account reuses its keep-alive connections.
+_SESSION_CACHE = {}
+_SESSION_CACHE_LOCK = threading.Lock()
+
+def _session_key(server_url):
+    """server_url with case, default port and trailing slash normalised away."""
+    server_url = (server_url or "").strip()
+    try:
+        parsed = urlparse(server_url)
+        if parsed.scheme and parsed.hostname:
+            scheme = parsed.scheme.lower()
+            return _server_base_url(scheme, parsed.hostname, parsed.port) + parsed.path.rstrip('/')
+    except ValueError: # Malformed port
+        pass
+    return server_url.rstrip('/')
+
+def _get_session(server_url):
+    key = _session_key(server_url)
+    with _SESSION_CACHE_LOCK:
+        session = _SESSION_CACHE.get(key)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            session.headers.update(API_HEADERS)
+            _SESSION_CACHE[key] = session
+        return session
+
+@lru_cache(maxsize=256)
+def _player_api_base(server_url, username, password):
+    """'<server>/player_api.php?username=..&password=..&' with the credentials percent-encoded."""
+    return server_url.rstrip('/') + "/player_api.php?" + urlencode({'username': username, 'password': password}) + "&"
+
+def invalidate_session_cache(server_url):
+    # Not closed here: other entries' workers on this server may still be using it. It closes
+    # once the last of them lets go of it.
+    with _SESSION_CACHE_LOCK:
+        _SESSION_CACHE.pop(_session_key(server_url), None)
+
+def close_http_sessions():
+    with _SESSION_CACHE_LOCK:
+        for session in _SESSION_CACHE.values():
+            session.close()
+        _SESSION_CACHE.clear()
+
+def _get_json_streamed(session, api_url):
+    """GET and decode a potentially large JSON body (stream listings, series info).
+
+    The body is read into one growing buffer rather than letting requests join the chunks into
+    .content first; json and orjson both decode a bytearray directly.
+    """
+    with session.get(api_url, timeout=API_TIMEOUT, stream=True) as response:
+        response.raise_for_status()
+        buf = bytearray()
+        for chunk in response.iter_content(STREAM_READ_CHUNK_SIZE):
+            buf.extend(chunk)
+    return _json_loads(buf)
+
 class CategoryLoaderWorker(QObject):
     data_ready = Signal(dict)
     error_occurred = Signal(str)
@@ -962,41 +1583,51 @@ class CategoryLoaderWorker(QObject):
         super().__init__()
         self.entry_data = entry_data
         self._session = None
+        self._api_base = None
 
     @Slot()
     def run(self):
         category_data = {'live': [], 'movie': [], 'series': []}
         try:
-            self._session = requests.Session()
             # Note: Xtream Codes API uses 'get_vod_categories' for movies.
             action_map = {'live': 'get_live_categories', 'movie': 'get_vod_categories', 'series': 'get_series_categories'}
 
-            server_url = self.entry_data['server_base_url']
-            username = self.entry_data['username']
-            password = self.entry_data['password']
-
-            for cat_type, action in action_map.items():
-                try:
-                    api_url = f"{server_url.rstrip('/')}/player_api.php?username={username}&password={password}&action={action}"
-                    response = self._session.get(api_url, timeout=API_TIMEOUT, headers=API_HEADERS)
-                    response.raise_for_status()
-                    data = response.json()
-                    if isinstance(data, list):
-                        category_data[cat_type] = data
-                except (requests.exceptions.RequestException, json.JSONDecodeError) as e:
-                    logging.warning(f"Could not fetch categories for type '{cat_type}': {e}")
+            self._session = _get_session(self.entry_data['server_base_url'])
+            self._api_base = _player_api_base(self.entry_data['server_base_url'],
+                                              self.entry_data['username'], self.entry_data['password'])
+
+            # The three lists are independent, so fetch them side by side on the shared session.
+            with concurrent.futures.ThreadPoolExecutor(max_workers=len(action_map)) as executor:
+                futures = {executor.submit(self._fetch_one, action): cat_type for cat_type, action in action_map.items()}
+                for future in concurrent.futures.as_completed(futures):
+                    cat_type = futures[future]
+                    try:
+                        data = future.result()
+                        if isinstance(data, list):
+                            category_data[cat_type] = data
+                    except (requests.exceptions.RequestException, json.JSONDecodeError) as e:
+                        logging.warning("Could not fetch categories for type '%s': %s", cat_type, e)
 
             self.data_ready.emit(category_data)
 
         except Exception as e:
             self.error_occurred.emit(f"An unexpected error occurred while loading categories: {e}")
         finally:
-            if self._session:
-                self._session.close()
             self.finished.emit()
 
-class StreamLoaderWorker(QObject):
+    def _fetch_one(self, action):
+        api_url = self._api_base + urlencode({'action': action})
+        response = self._session.get(api_url, timeout=API_TIMEOUT)
+        response.raise_for_status()
+        return _json_loads(response.content)
+
+# The stream fields the playlist browser reads; incremental parsing keeps only these.
+_STREAM_FIELDS = ('name', 'title', 'series_id', 'stream_id', 'id', 'epg_id', 'container_extension')
+
+class StreamLoaderWorker(_CancellableWorker, QObject):
     data_ready = Signal(list)
+    data_chunk_ready = Signal(list) # Part of a listing parsed incrementally
+    chunks_finished = Signal(int) # Incremental listing complete; total stream count
     error_occurred = Signal(str)
     finished = Signal()
 
@@ -1006,11 +1637,11 @@ class StreamLoaderWorker(QObject):
         self.category_id = category_id
         self.stream_type = stream_type # 'live', 'movie', or 'series'
         self._session = None
+        self._api_base = _player_api_base(entry_data['server_base_url'], entry_data['username'], entry_data['password'])
 
     @Slot()
     def run(self):
         try:
-            self._session = requests.Session()
             action_map = {
                 'live': 'get_live_streams',
                 'movie': 'get_vod_streams',
@@ -1020,17 +1651,21 @@ class StreamLoaderWorker(QObject):
             if not action:
                 raise ValueError(f"Invalid stream type: {self.stream_type}")
 
-            server_url = self.entry_data['server_base_url']
-            username = self.entry_data['username']
-            password = self.entry_data['password']
+            self._session = _get_session(self.entry_data['server_base_url'])
 
-            api_url = f"{server_url.rstrip('/')}/player_api.php?username={username}&password={password}&action={action}"
+            params = {'action': action}
             if self.category_id != '*':
-                api_url += f"&category_id={self.category_id}"
-            response = self._session.get(api_url, timeout=API_TIMEOUT, headers=API_HEADERS)
-            response.raise_for_status()
-            data = response.json()
+                params['category_id'] = self.category_id
+            api_url = self._api_base + urlencode(params)
+            if ijson is not None:
+                data = self._load_incrementally(api_url)
+                if data is None:
+                    return # Already delivered through data_chunk_ready / chunks_finished
+            else:
+                data = _get_json_streamed(self._session, api_url)
 
+            if self._cancelled:
+                return
             if isinstance(data, list):
                 self.data_ready.emit(data)
             else:
@@ -1043,11 +1678,59 @@ class StreamLoaderWorker(QObject):
         except Exception as e:
             self.error_occurred.emit(f"An unexpected error occurred loading streams: {e}")
         finally:
-            if self._session:
-                self._session.close()
             self.finished.emit()
 
-class SeriesInfoWorker(QObject):
+    def _load_incrementally(self, api_url):
+        """Parse a large listing with ijson, emitting trimmed stream dicts in chunks as they arrive.
+
+        Returns None once the listing has been emitted, or the decoded body when it is small or
+        not a JSON array (so the caller handles it like a normal response).
+        """
+        with self._session.get(api_url, timeout=API_TIMEOUT, stream=True) as response:
+            response.raise_for_status()
+            size = int(response.headers.get('Content-Length') or 0)
+            if 0 < size < STREAM_INCREMENTAL_MIN_BYTES:
+                return _json_loads(response.content)
+
+            body_chunks = response.iter_content(STREAM_READ_CHUNK_SIZE)
+            head = b""
+            for data in body_chunks:
+                head += data
+                if head.strip(): break
+            if not head.lstrip().startswith(b'['):
+                # Error object or similar: decode it whole like a normal response
+                buf = bytearray(head)
+                for data in body_chunks:
+                    buf.extend(data)
+                return _json_loads(buf)
+
+            # Push parser: items parsed from each network chunk land in `parsed`
+            parsed = ijson.sendable_list()
+            parser = ijson.items_coro(parsed, 'item', use_float=True)
+            total = 0
+            chunk = []
+            data = head
+            while data is not None:
+                if self._cancelled:
+                    return None # Abandoned: stop reading, emit nothing
+                parser.send(data)
+                for stream in parsed:
+                    if isinstance(stream, dict):
+                        chunk.append({key: stream[key] for key in _STREAM_FIELDS if key in stream})
+                del parsed[:]
+                if len(chunk) >= STREAM_EMIT_CHUNK_SIZE:
+                    total += len(chunk)
+                    self.data_chunk_ready.emit(chunk)
+                    chunk = []
+                data = next(body_chunks, None)
+            parser.close()
+            if chunk:
+                total += len(chunk)
+                self.data_chunk_ready.emit(chunk)
+        self.chunks_finished.emit(total)
+        return None
+
+class SeriesInfoWorker(_CancellableWorker, QObject):
     data_ready = Signal(object)
     error_occurred = Signal(str)
     finished = Signal()
@@ -1057,20 +1740,17 @@ class SeriesInfoWorker(QObject):
         self.entry_data = entry_data
         self.series_id = series_id
         self._session = None
+        self._api_base = _player_api_base(entry_data['server_base_url'], entry_data['username'], entry_data['password'])
 
     @Slot()
     def run(self):
         try:
-            self._session = requests.Session()
-            server_url = self.entry_data['server_base_url']
-            username = self.entry_data['username']
-            password = self.entry_data['password']
+            self._session = _get_session(self.entry_data['server_base_url'])
 
-            api_url = f"{server_url.rstrip('/')}/player_api.php?username={username}&password={password}&action=get_series_info&series_id={self.series_id}"
-            response = self._session.get(api_url, timeout=API_TIMEOUT, headers=API_HEADERS)
-            response.raise_for_status()
-            data = response.json()
-            self.data_ready.emit(data)
+            api_url = self._api_base + urlencode({'action': 'get_series_info', 'series_id': self.series_id})
+            data = _get_json_streamed(self._session, api_url)
+            if not self._cancelled:
+                self.data_ready.emit(data)
 
         except requests.exceptions.RequestException as e:
             self.error_occurred.emit(f"Network Error: {e}")
@@ -1079,18 +1759,32 @@ class SeriesInfoWorker(QObject):
         except Exception as e:
             self.error_occurred.emit(f"An unexpected error occurred: {e}")
         finally:
-            if self._session:
-                self._session.close()
             self.finished.emit()
 
+# Lowercased copy of a playlist row's name, stored on the name item when the row is built.
+PLAYLIST_SEARCH_ROLE = Qt.UserRole + 3
+# Bitmask of the characters in that name (see playlist_char_mask), checked before any substring test.
+PLAYLIST_MASK_ROLE = Qt.UserRole + 4
+PLAYLIST_SEARCH_DEBOUNCE_MS = 150
+
+def playlist_char_mask(text):
+    """63-bit set of the characters in ``text``. A term can only occur in a name whose mask covers the term's mask."""
+    mask = 0
+    for ch in set(text):
+        mask |= 1 << (ord(ch) % 63)
+    return mask
+
 class PlaylistFilterProxyModel(QSortFilterProxyModel):
     def __init__(self, parent=None):
         super().__init__(parent)
         self._search_terms = []
+        self._search_mask = 0
 
     def set_search_text(self, text):
         """Splits the search text into terms and triggers a filter update."""
-        self._search_terms = text.lower().split()
+        # Longest (most selective) terms first so non-matching rows are rejected sooner.
+        self._search_terms = sorted(text.lower().split(), key=len, reverse=True)
+        self._search_mask = playlist_char_mask("".join(self._search_terms))
         self.invalidate()
 
     def filterAcceptsRow(self, source_row, source_parent):
@@ -1102,12 +1796,17 @@ class PlaylistFilterProxyModel(QSortFilterProxyModel):
             return True # No filter, show all
 
         index = self.sourceModel().index(source_row, 0, source_parent)
-        item_text = self.sourceModel().data(index, Qt.DisplayRole)
-        if not item_text:
+        row_mask = self.sourceModel().data(index, PLAYLIST_MASK_ROLE)
+        if row_mask is not None and row_mask & self._search_mask != self._search_mask:
+            return False # Some search character never appears in the name
+
+        item_text_lower = self.sourceModel().data(index, PLAYLIST_SEARCH_ROLE)
+        if item_text_lower is None: # Row built without the search role
+            item_text = self.sourceModel().data(index, Qt.DisplayRole)
+            item_text_lower = item_text.lower() if item_text else ""
+        if not item_text_lower:
             return False
 
-        item_text_lower = item_text.lower()
-
         # Check if all search terms are in the item text
         for term in self._search_terms:
             if term not in item_text_lower:
@@ -1115,6 +1814,75 @@ class PlaylistFilterProxyModel(QSortFilterProxyModel):
 
         return True
 
+def stream_row(name, stream_id, container_extension=None, epg_id=None):
+    """Row tuple for StreamTableModel: (name, stream_id, container_extension, epg_id, search_text, char_mask)."""
+    search_text = name.lower()
+    return (name, stream_id, container_extension, epg_id, search_text, playlist_char_mask(search_text))
+
+class StreamTableModel(QAbstractTableModel):
+    """Read-only playlist table (Name, Stream ID, EPG) backed by a list of stream_row() tuples.
+
+    The search text and mask (name column) and the container extension and EPG id (id column)
+    are served as item roles straight from the tuples, so nothing is allocated per cell.
+    """
+    HEADERS = ("Name", "Stream ID", "EPG")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+        self._epg_text = {} # row -> current programme, filled as EPG arrives
+
+    def set_rows(self, rows):
+        self.beginResetModel()
+        self._rows = list(rows)
+        self._epg_text = {}
+        self.endResetModel()
+
+    def append_rows(self, rows):
+        if not rows: return
+        start = len(self._rows)
+        self.beginInsertRows(QModelIndex(), start, start + len(rows) - 1)
+        self._rows.extend(rows)
+        self.endInsertRows()
+
+    def clear(self):
+        self.set_rows([])
+
+    def set_epg_text(self, row, text):
+        self._epg_text[row] = text
+        index = self.index(row, 2)
+        self.dataChanged.emit(index, index)
+
+    def stream_at(self, row):
+        """(stream_id, container_extension) for a source row."""
+        stream = self._rows[row]
+        return stream[1], stream[2]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole: return None
+        if orientation == Qt.Horizontal:
+            return self.HEADERS[section] if 0 <= section < len(self.HEADERS) else None
+        return section + 1
+
+    def data(self, index, role=Qt.DisplayRole):
+        column = index.column()
+        if role == Qt.DisplayRole:
+            if column == 2: return self._epg_text.get(index.row(), "")
+            return self._rows[index.row()][column]
+        if column == 0:
+            if role == PLAYLIST_SEARCH_ROLE: return self._rows[index.row()][4]
+            if role == PLAYLIST_MASK_ROLE: return self._rows[index.row()][5]
+        elif column == 1:
+            if role == Qt.UserRole + 1: return self._rows[index.row()][2] # container_extension
+            if role == Qt.UserRole + 2: return self._rows[index.row()][3] # epg_id
+        return None
+
 class PlaylistBrowserDialog(QDialog):
     def __init__(self, entry_data, parent=None):
         super().__init__(parent)
@@ -1126,6 +1894,9 @@ class PlaylistBrowserDialog(QDialog):
         self.stream_worker_thread = None
         self.series_info_thread = None
         self.playback_thread = None
+        self.stream_worker = None
+        self.series_worker = None
+        self._retired_threads = set() # Cancelled loader threads still finishing their request
         self.original_window_title = f"Playlist for {self.entry_data['name']}"
 
         self.setWindowTitle(self.original_window_title)
@@ -1141,8 +1912,8 @@ class PlaylistBrowserDialog(QDialog):
         self.status_label = QLabel("Loading categories...")
 
         # Models for the table
-        self.stream_model = QStandardItemModel(0, 3) # Name, Stream ID (hidden), EPG
-        self.stream_model.setHorizontalHeaderLabels(["Name", "Stream ID", "EPG"])
+        self.stream_model = StreamTableModel(self) # Name, Stream ID (hidden), EPG
+        self._epg_row_index = {} # epg_id -> source row, for update_epg_data
         self.proxy_model = PlaylistFilterProxyModel()
         self.proxy_model.setSourceModel(self.stream_model)
         self.proxy_model.setFilterKeyColumn(0)
@@ -1183,7 +1954,12 @@ class PlaylistBrowserDialog(QDialog):
         self.main_layout.addLayout(right_layout, 3)
 
     def setup_connections(self):
-        self.search_bar.textChanged.connect(self.proxy_model.set_search_text)
+        # Re-filter once typing pauses rather than on every keystroke.
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(PLAYLIST_SEARCH_DEBOUNCE_MS)
+        self._search_timer.timeout.connect(lambda: self.proxy_model.set_search_text(self.search_bar.text()))
+        self.search_bar.textChanged.connect(self._search_timer.start)
         self.category_tree.itemClicked.connect(self.on_category_clicked)
         self.play_button.clicked.connect(self.on_play_clicked)
         self.stream_table.doubleClicked.connect(self.on_play_clicked)
@@ -1219,59 +1995,74 @@ class PlaylistBrowserDialog(QDialog):
     def update_epg_data(self, channel_id, epg_list):
         if not epg_list: return
 
-        # Get current program
-        now = time.time()
-        current_prog_name = ""
-
-        for prog in epg_list:
-            try:
-                start = int(prog.get('start_timestamp', 0))
-                end = int(prog.get('stop_timestamp', 0))
-                if start <= now < end:
-                    current_prog_name = prog.get('name', '')
-                    break
-            except: pass
-
+        current_prog_name = current_programme_name(epg_schedule(epg_list), time.time())
         if not current_prog_name: return
 
-        # Find item in model
-        for row in range(self.stream_model.rowCount()):
-            id_item = self.stream_model.item(row, 1)
-            # Retrieve stored EPG ID
-            stored_epg_id = id_item.data(Qt.UserRole + 2)
-            if stored_epg_id == channel_id:
-                epg_item = QStandardItem(current_prog_name)
-                self.stream_model.setItem(row, 2, epg_item)
-                return
+        row = self._epg_row_index.get(channel_id)
+        if row is None: return # Channel no longer listed (category changed)
+        self.stream_model.set_epg_text(row, current_prog_name)
 
     @Slot(dict)
     def on_categories_ready(self, data):
-        self.category_data = data
-        self.category_tree.clear()
+        if data == self.category_data and self.category_tree.topLevelItemCount():
+            # Same categories as already shown: keep the tree (and its selection) as is
+            self.status_label.setText("Ready. Select a category.")
+            self.category_worker_thread.quit()
+            return
 
+        self.category_data = data
         type_map = {'live': "Live TV", 'movie': "Movies", 'series': "Series"}
 
-        for cat_type, categories in self.category_data.items():
-            if categories:
-                top_level_item = QTreeWidgetItem([type_map[cat_type]])
-                self.category_tree.addTopLevelItem(top_level_item)
+        tree = self.category_tree
+        tree.setUpdatesEnabled(False)
+        tree.blockSignals(True)
+        try:
+            tree.clear()
+            top_level_items = []
+            for cat_type, categories in self.category_data.items():
+                if categories:
+                    top_level_item = QTreeWidgetItem([type_map[cat_type]])
+                    # Item data is a (type, category_id) tuple; "All" uses '*' as the id
+                    all_child_item = QTreeWidgetItem(["All"])
+                    all_child_item.setData(0, Qt.UserRole, (cat_type, '*'))
+                    children = [all_child_item]
+                    for category in categories:
+                        child_item = QTreeWidgetItem([category['category_name']])
+                        child_item.setData(0, Qt.UserRole, (cat_type, category['category_id']))
+                        children.append(child_item)
+                    top_level_item.addChildren(children)
+                    top_level_items.append(top_level_item)
+            tree.addTopLevelItems(top_level_items)
+            tree.expandAll()
+        finally:
+            tree.blockSignals(False)
+            tree.setUpdatesEnabled(True)
+        self.status_label.setText("Ready. Select a category.")
+        self.category_worker_thread.quit()
 
-                # Add "All" sub-category
-                all_child_item = QTreeWidgetItem(["All"])
-                all_child_item.setData(0, Qt.UserRole, {'type': cat_type, 'id': '*'})
-                top_level_item.addChild(all_child_item)
+    def _retire_loader(self, worker, thread):
+        """Cancel a loader and let its thread finish in the background instead of blocking the UI on wait()."""
+        if worker is not None:
+            worker.cancel()
+        if thread is not None and thread.isRunning():
+            thread.quit()
+            self._retired_threads.add(thread)
+            thread.finished.connect(self._drop_retired_thread)
 
-                for category in categories:
-                    child_item = QTreeWidgetItem([category['category_name']])
-                    child_item.setData(0, Qt.UserRole, {'type': cat_type, 'id': category['category_id']})
-                    top_level_item.addChild(child_item)
+    @Slot()
+    def _drop_retired_thread(self):
+        thread = self.sender()
+        if thread in self._retired_threads:
+            thread.wait() # Already finished; just lets the QThread fully exit before it is released
+            self._retired_threads.discard(thread)
 
-        self.category_tree.expandAll()
-        self.status_label.setText("Ready. Select a category.")
-        self.category_worker_thread.quit()
+    def _from_cancelled_loader(self):
+        """True when the signal being handled came from a loader that has since been cancelled."""
+        return getattr(self.sender(), '_cancelled', False)
 
     @Slot(str)
     def on_load_error(self, error_message):
+        if self._from_cancelled_loader(): return
         QMessageBox.critical(self, "Error Loading Playlist", error_message)
         self.status_label.setText(f"Error: {error_message}")
         if self.category_worker_thread and self.category_worker_thread.isRunning():
@@ -1283,14 +2074,9 @@ class PlaylistBrowserDialog(QDialog):
 
     @Slot(QTreeWidgetItem, int)
     def on_category_clicked(self, item, column):
-        # Stop any existing worker threads before starting a new one
-        if self.stream_worker_thread:
-            self.stream_worker_thread.quit()
-            self.stream_worker_thread.wait()
-
-        if self.series_info_thread:
-            self.series_info_thread.quit()
-            self.series_info_thread.wait()
+        # Cancel any loaders still running; their threads wind down in the background
+        self._retire_loader(self.stream_worker, self.stream_worker_thread)
+        self._retire_loader(self.series_worker, self.series_info_thread)
 
         if self.windowTitle() != self.original_window_title:
             self.setWindowTitle(self.original_window_title)
@@ -1300,8 +2086,7 @@ class PlaylistBrowserDialog(QDialog):
         stream_type = None
 
         if category_info: # It's a sub-category item
-            cat_id = category_info.get('id', '*') # Use '*' for 'All'
-            stream_type = category_info.get('type')
+            stream_type, cat_id = category_info # cat_id is '*' for 'All'
         elif not item.parent(): # It's a top-level item
             top_level_text = item.text(0)
             if top_level_text == "Live TV":
@@ -1316,7 +2101,8 @@ class PlaylistBrowserDialog(QDialog):
             return
 
         self.status_label.setText(f"Loading {item.text(0)}...")
-        self.stream_model.removeRows(0, self.stream_model.rowCount())
+        self._epg_row_index = {}
+        self.stream_model.clear()
 
         # Start the stream loader worker
         account_type = self.entry_data.get('account_type', 'xc')
@@ -1324,6 +2110,8 @@ class PlaylistBrowserDialog(QDialog):
             self.stream_worker = StalkerStreamLoaderWorker(self.entry_data, cat_id, stream_type)
         else:
             self.stream_worker = StreamLoaderWorker(self.entry_data, cat_id, stream_type)
+            self.stream_worker.data_chunk_ready.connect(self.on_stream_chunk_ready)
+            self.stream_worker.chunks_finished.connect(self.on_stream_chunks_finished)
 
         self.stream_worker_thread = QThread()
         self.stream_worker.moveToThread(self.stream_worker_thread)
@@ -1334,9 +2122,25 @@ class PlaylistBrowserDialog(QDialog):
         self.stream_worker.finished.connect(self.stream_worker.deleteLater)
         self.stream_worker_thread.start()
 
-    @Slot(list)
-    def on_streams_ready(self, streams):
-        self.stream_model.removeRows(0, self.stream_model.rowCount())
+    def _set_stream_rows(self, rows, append=False):
+        """Replace the stream model's contents with ``rows`` (stream_row() tuples), or add them
+        after the existing rows when ``append`` is set. Either way the proxy and view see a
+        single reset or insert.
+        """
+        self.stream_table.setUpdatesEnabled(False)
+        try:
+            if append:
+                self.stream_model.append_rows(rows)
+            else:
+                self.stream_model.set_rows(rows)
+        finally:
+            self.stream_table.setUpdatesEnabled(True)
+
+    def _add_streams(self, streams, append=False):
+        """Build rows for ``streams`` and put them in the model (replacing or appending), then request their EPG."""
+        start = self.stream_model.rowCount() if append else 0
+        rows = []
+        epg_rows = {}
         for stream in streams:
             name = stream.get('name', 'No Name')
 
@@ -1356,38 +2160,48 @@ class PlaylistBrowserDialog(QDialog):
             container_extension = stream.get('container_extension')
             epg_id = stream.get('epg_id')
 
-            name_item = QStandardItem(name)
-            id_item = QStandardItem(stream_id)
-            epg_item = QStandardItem("") # Empty initially
-
-            # Store container_extension in UserRole of id_item
-            if container_extension:
-                id_item.setData(container_extension, Qt.UserRole + 1) # UserRole + 1 for extension
+            epg_id = str(epg_id) if epg_id else None
+            if epg_id: epg_rows.setdefault(epg_id, start + len(rows))
+            # EPG cell stays empty until update_epg_data fills it
+            rows.append(stream_row(str(name) if name else "", stream_id, container_extension or None, epg_id))
 
-            # Store EPG ID
-            if epg_id:
-                id_item.setData(str(epg_id), Qt.UserRole + 2)
-
-            self.stream_model.appendRow([name_item, id_item, epg_item])
+        self._set_stream_rows(rows, append)
+        if append:
+            epg_rows = {epg_id: row for epg_id, row in epg_rows.items() if epg_id not in self._epg_row_index}
+            self._epg_row_index.update(epg_rows)
+        else:
+            self._epg_row_index = epg_rows
 
-            # Trigger EPG fetch if we have an EPG ID and manager
-            if epg_id and hasattr(self, 'epg_manager') and self.epg_manager.isRunning():
-                self.epg_manager.request_epg(str(epg_id))
+        # Trigger EPG fetch if we have an EPG ID and manager
+        if epg_rows and hasattr(self, 'epg_manager') and self.epg_manager.isRunning():
+            self.epg_manager.request_epg_batch(list(epg_rows))
 
+    @Slot(list)
+    def on_streams_ready(self, streams):
+        if self._from_cancelled_loader(): return
+        self._add_streams(streams)
         self.status_label.setText(f"Loaded {len(streams)} items.")
         self.stream_worker_thread.quit()
 
+    @Slot(list)
+    def on_stream_chunk_ready(self, streams):
+        if self._from_cancelled_loader(): return
+        self._add_streams(streams, append=True)
+        self.status_label.setText(f"Loading... {self.stream_model.rowCount()} items so far.")
+
+    @Slot(int)
+    def on_stream_chunks_finished(self, total):
+        if self._from_cancelled_loader(): return
+        self.status_label.setText(f"Loaded {total} items.")
+        self.stream_worker_thread.quit()
+
     def on_play_clicked(self):
         selected_indexes = self.stream_table.selectionModel().selectedRows()
         if not selected_indexes:
             return
 
         source_index = self.proxy_model.mapToSource(selected_indexes[0])
-        id_item = self.stream_model.item(source_index.row(), 1)
-        stream_id = id_item.text()
-
-        # Retrieve container extension from UserRole + 1
-        container_extension = id_item.data(Qt.UserRole + 1)
+        stream_id, container_extension = self.stream_model.stream_at(source_index.row())
 
         # Check if we are in an episode view by checking the window title,
         # which is changed when series info is loaded.
@@ -1485,9 +2299,7 @@ class PlaylistBrowserDialog(QDialog):
         self.media_player_manager.play_stream(stream_url, self, referer_url=server)
 
     def fetch_series_episodes(self, series_id):
-        if self.series_info_thread:
-            self.series_info_thread.quit()
-            self.series_info_thread.wait()
+        self._retire_loader(self.series_worker, self.series_info_thread)
 
         self.status_label.setText(f"Fetching episodes for series ID: {series_id}...")
 
@@ -1508,36 +2320,25 @@ class PlaylistBrowserDialog(QDialog):
 
     @Slot(object)
     def on_series_info_ready(self, data):
+        if self._from_cancelled_loader(): return
         if not isinstance(data, dict):
-            logging.error(f"Series Info API returned unexpected type: {type(data)}. Data: {data}")
+            logging.error("Series Info API returned unexpected type: %s. Data: %s", type(data), data)
             self.status_label.setText("Error: API returned invalid data format for Series Info.")
             if self.series_info_thread and self.series_info_thread.isRunning():
                 self.series_info_thread.quit()
             return
 
-        self.stream_model.removeRows(0, self.stream_model.rowCount())
+        self._epg_row_index = {} # Episodes carry no EPG
         series_name = data.get('info', {}).get('name', 'Series')
         self.setWindowTitle(f"Episodes for: {series_name}")
 
         episodes = data.get('episodes', {})
 
-        # Helper function to add an episode to the model
-        def add_episode_to_model(episode):
-            title = episode.get('title', 'No Title')
-            episode_id = str(episode.get('id'))
-            season_num = episode.get('season', 0)
-            episode_num = episode.get('episode_num', 0)
-            container_extension = episode.get('container_extension')
-
-            display_title = f"S{season_num} E{episode_num} - {title}"
-            name_item = QStandardItem(display_title)
-            id_item = QStandardItem(episode_id)
-
-            # Store container_extension in UserRole + 1
-            if container_extension:
-                id_item.setData(container_extension, Qt.UserRole + 1)
-
-            self.stream_model.appendRow([name_item, id_item])
+        # Build the model row for one episode
+        def episode_row(episode):
+            get = episode.get
+            display_title = f"S{get('season', 0)} E{get('episode_num', 0)} - {get('title', 'No Title')}"
+            return stream_row(display_title, str(get('id')), get('container_extension') or None)
 
         # Handle both dictionary (grouped by season) and list (flat) of episodes
         if isinstance(episodes, dict):
@@ -1547,14 +2348,13 @@ class PlaylistBrowserDialog(QDialog):
             except (ValueError, TypeError):
                 sorted_seasons = sorted(episodes.keys())
 
-            for season_num in sorted_seasons:
-                season_episodes = episodes[season_num]
-                if isinstance(season_episodes, list):
-                    for episode in season_episodes:
-                        add_episode_to_model(episode)
+            all_episodes = [episode for season_num in sorted_seasons if isinstance(episodes[season_num], list)
+                            for episode in episodes[season_num]]
         elif isinstance(episodes, list):
-            for episode in episodes:
-                add_episode_to_model(episode)
+            all_episodes = episodes
+        else:
+            all_episodes = []
+        self._set_stream_rows([episode_row(episode) for episode in all_episodes])
 
         # self.category_list.hide() # QTreeWidget is used now
         # self.back_button.show() # Back button is removed
@@ -1563,7 +2363,7 @@ class PlaylistBrowserDialog(QDialog):
 
     def closeEvent(self, event):
         for thread in (self.category_worker_thread, self.stream_worker_thread,
-                       self.series_info_thread, self.playback_thread):
+                       self.series_info_thread, self.playback_thread, *self._retired_threads):
             if thread:
                 thread.quit()
                 thread.wait()
@@ -1577,6 +2377,84 @@ class PlaylistBrowserDialog(QDialog):
 # =============================================================================
 # API CHECKER WORKER
 # =============================================================================
+def _entry_host_key(entry):
+    """Int key for the host (scheme://netloc) an entry's checks are sent to, used to throttle per provider."""
+    url = entry['portal_url'] if entry['account_type'] == 'stalker' else entry['server_base_url']
+    return _host_key_for_url(url or "")
+
+@lru_cache(maxsize=1024)
+def _host_key_for_url(url):
+    # CRC32 of the lowercased origin. A collision only merges two hosts' throttle lanes.
+    parsed = urlparse(url)
+    return zlib.crc32(f"{parsed.scheme}://{parsed.netloc}".lower().encode())
+
+class _HostThrottle:
+    """Per-host spacing for outgoing checks: at most one request every ``interval`` seconds per host."""
+    def __init__(self, interval):
+        self._interval = interval
+        self._next_slot = {}
+
+    async def wait(self, host):
+        if self._interval <= 0: return
+        now = time.monotonic()
+        slot = max(now, self._next_slot.get(host, now))
+        self._next_slot[host] = slot + self._interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+class _CheckerLoop:
+    """One asyncio loop on a daemon thread plus the IPTVChecker that lives on it.
+
+    Every check batch runs on this loop, so the checker's aiohttp connection pool (and the
+    keep-alive connections in it) survives from one batch to the next.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loop = None
+        self._thread = None
+        self.checker = None
+
+    def ensure_running(self):
+        """Start the loop thread and its checker if they aren't running yet; returns the loop."""
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name="api-checker-loop", daemon=True)
+                self._thread.start()
+                self.checker = IPTVChecker()
+            return self._loop
+
+    def run(self, coro):
+        """Run ``coro`` on the loop and block the calling thread until it finishes."""
+        return asyncio.run_coroutine_threadsafe(coro, self.ensure_running()).result()
+
+    def close(self):
+        with self._lock:
+            loop, thread, checker = self._loop, self._thread, self.checker
+            self._loop = self._thread = self.checker = None
+        if loop is None: return
+        try:
+            asyncio.run_coroutine_threadsafe(self._shutdown(checker), loop).result(timeout=5)
+        except Exception as e:
+            logging.warning("Error closing checker session: %s", e)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+        loop.close()
+
+    @staticmethod
+    async def _shutdown(checker):
+        """Cancel any batch still running and let it unwind before its session is closed under it."""
+        batches = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in batches:
+            task.cancel()
+        await asyncio.gather(*batches, return_exceptions=True)
+        await checker.close_session()
+
+_CHECKER_LOOP = _CheckerLoop()
+
+def close_checker_loop():
+    _CHECKER_LOOP.close()
+
 class ApiCheckerWorker(QObject):
     result_ready = Signal(int, dict)
     status_message_updated = Signal(str)
@@ -1594,11 +2472,12 @@ class ApiCheckerWorker(QObject):
         # Renamed logic but kept name for compatibility if needed, though we update caller
         try:
             logging.info("API Worker: Initializing Async Checker...")
-            self.checker = IPTVChecker()
+            _CHECKER_LOOP.ensure_running()
+            self.checker = _CHECKER_LOOP.checker
             logging.info("API Worker: Async Checker initialized.")
             self.session_initialized_signal.emit()
         except Exception as e:
-            logging.error(f"API Worker: Failed to initialize checker: {e}")
+            logging.error("API Worker: Failed to initialize checker: %s", e)
             self.status_message_updated.emit("Error: Could not initialize checker.")
             self._is_running = False
 
@@ -1613,100 +2492,106 @@ class ApiCheckerWorker(QObject):
 
         self._is_running = True
         try:
-            asyncio.run(self.run_async_checks(entry_ids_to_check))
+            _CHECKER_LOOP.run(self.run_async_checks(entry_ids_to_check))
+        except concurrent.futures.CancelledError:
+            logging.info("API Worker: Check batch cancelled at shutdown.")
         except Exception as e:
-            logging.error(f"Fatal error in async check loop: {e}")
+            logging.error("Fatal error in async check loop: %s", e)
         finally:
             self.batch_finished.emit()
 
     async def run_async_checks(self, entry_ids):
         total = len(entry_ids)
-        processed_count = 0
+        self._processed_count = 0
+        self._total = total
         self.progress_updated.emit(0, total)
 
-        try:
-            for entry_id in entry_ids:
-                if not self._is_running:
-                    self.status_message_updated.emit("Stopping...")
-                    break
-
-                try:
-                    entry = get_entry_by_id(entry_id)
-                    if not entry:
-                        logging.warning(f"Worker: Entry ID {entry_id} not found.")
-                        processed_count += 1
-                        self.progress_updated.emit(processed_count, total)
-                        continue
-
-                    # Check Frozen Status
-                    frozen_until = entry['frozen_until'] or 0
-                    if time.time() < frozen_until:
-                        # Skip check
-                        frozen_dt = datetime.fromtimestamp(frozen_until).strftime('%H:%M:%S')
-                        msg = f"Skipped (Frozen until {frozen_dt})"
-                        # We send a result to update the UI status column but mostly to show skipping
-                        self.result_ready.emit(entry_id, {
-                            'api_status': 'Frozen',
-                            'api_message': msg,
-                            # Persist existing values
-                            'bad_count': entry['bad_count'],
-                            'frozen_until': entry['frozen_until']
-                        })
-                        processed_count += 1
-                        self.progress_updated.emit(processed_count, total)
-                        continue
-
+        # Entries on different hosts are checked concurrently; each host gets one
+        # sequential lane so no provider sees more than one check at a time.
+        lanes = {}
+        for entry_id in entry_ids:
+            entry = get_entry_by_id(entry_id)
+            if not entry:
+                logging.warning("Worker: Entry ID %s not found.", entry_id)
+                self._mark_processed()
+                continue
+            lanes.setdefault(_entry_host_key(entry), []).append(entry)
+
+        throttle = _HostThrottle(REQUEST_DELAY_BETWEEN_CHECKS)
+        in_flight = asyncio.Semaphore(MAX_CONCURRENT_CHECKS)
+        await asyncio.gather(*(self._check_host_lane(host, entries, throttle, in_flight) for host, entries in lanes.items()))
+
+        if not self._is_running:
+            self.status_message_updated.emit("Stopping...")
+        self.status_message_updated.emit(f"Finished checking {self._processed_count}/{total} entries.")
+        # The checker's session stays open on the shared loop for the next batch.
+
+    def _mark_processed(self):
+        self._processed_count += 1
+        self.progress_updated.emit(self._processed_count, self._total)
+
+    async def _check_host_lane(self, host, entries, throttle, in_flight):
+        for entry in entries:
+            if not self._is_running:
+                return
+            entry_id = entry['id']
+            try:
+                # Check Frozen Status
+                frozen_until = entry['frozen_until'] or 0
+                if time.time() < frozen_until:
+                    # Skip check
+                    frozen_dt = datetime.fromtimestamp(frozen_until).strftime('%H:%M:%S')
+                    msg = f"Skipped (Frozen until {frozen_dt})"
+                    # We send a result to update the UI status column but mostly to show skipping
+                    # No check_failed / frozen_until: the stored backoff state is left as is.
+                    self.result_ready.emit(entry_id, {'api_status': 'Frozen', 'api_message': msg})
+                    self._mark_processed()
+                    continue
+
+                async with in_flight:
+                    if not self._is_running:
+                        return
+                    await throttle.wait(host)
                     self.status_message_updated.emit(f"Checking: {entry['name']}...")
 
                     # Perform Async Check
                     entry_dict = dict(entry) # Convert Row to Dict
                     result = await self.checker.check_entry(entry_dict)
 
-                    # Update Backoff Logic
-                    current_bad = entry['bad_count'] or 0
-
-                    if result['success']:
-                        result['bad_count'] = 0
-                        result['frozen_until'] = 0
-                    else:
-                        # If check failed
-                        status_text = str(result.get('api_status', '')).lower()
-
-                        # Criteria for freezing: Auth failure or explicit error.
-                        # Network timeouts might be transient, but repeated ones should freeze.
-                        # For now, let's freeze on any failure that isn't just "Unknown".
-                        new_bad = current_bad + 1
-                        backoff = min(86400, (2 ** new_bad) * 60) # 1m, 2m, 4m, 8m... max 24h
-                        result['bad_count'] = new_bad
-                        result['frozen_until'] = time.time() + backoff
-
-                        if not result.get('api_message'):
-                            result['api_message'] = "Check Failed"
-                        result['api_message'] += f" (Frozen {backoff}s)"
+                # Update Backoff Logic
+                current_bad = entry['bad_count'] or 0
 
-                    self.result_ready.emit(entry_id, result)
+                if result['success']:
+                    result['check_failed'] = 0
+                    result['frozen_until'] = 0
+                else:
+                    # If check failed
+                    status_text = str(result.get('api_status', '')).lower()
 
-                    processed_count += 1
-                    self.progress_updated.emit(processed_count, total)
+                    # Criteria for freezing: Auth failure or explicit error.
+                    # Network timeouts might be transient, but repeated ones should freeze.
+                    # For now, let's freeze on any failure that isn't just "Unknown".
+                    new_bad = current_bad + 1
+                    backoff = MAX_CHECK_BACKOFF if new_bad >= _MAX_BACKOFF_SHIFT else 60 << new_bad # 2m, 4m, 8m... max 24h
+                    result['check_failed'] = 1 # bad_count is incremented by the UPDATE itself
+                    result['frozen_until'] = time.time() + backoff
 
-                    if REQUEST_DELAY_BETWEEN_CHECKS > 0:
-                        await asyncio.sleep(REQUEST_DELAY_BETWEEN_CHECKS)
+                    if not result.get('api_message'):
+                        result['api_message'] = "Check Failed"
+                    result['api_message'] += f" (Frozen {backoff}s)"
 
-                except Exception as e:
-                    logging.error(f"Worker: Error processing entry {entry_id}: {e}")
-                    self.result_ready.emit(entry_id, {'api_status': 'Error', 'api_message': f"Worker Error: {e}"})
-                    processed_count += 1
-                    self.progress_updated.emit(processed_count, total)
+                self.result_ready.emit(entry_id, result)
+                self._mark_processed()
 
-            self.status_message_updated.emit(f"Finished checking {processed_count}/{total} entries.")
-        finally:
-            # Ensure session is closed so it doesn't persist to a new asyncio loop next time
-            if self.checker:
-                await self.checker.close_session()
+            except Exception as e:
+                logging.error("Worker: Error processing entry %s: %s", entry_id, e)
+                self.result_ready.emit(entry_id, {'api_status': 'Error', 'api_message': f"Worker Error: {e}"})
+                self._mark_processed()
 
     def cleanup_session(self):
-        # Kept for QThread connection compatibility, though logic is handled in run_async_checks now
-        pass
+        # The checker and its connection pool belong to the shared loop, which is closed at exit
+        # (close_checker_loop); the worker only drops its reference.
+        self.checker = None
 
 
 # =============================================================================
@@ -1715,49 +2600,410 @@ class ApiCheckerWorker(QObject):
 COL_ID, COL_NAME, COL_CATEGORY, COL_STATUS, COL_CHANNELS, COL_MOVIES, COL_SERIES, COL_EXPIRY, COL_TRIAL, \
 COL_ACTIVE_CONN, COL_MAX_CONN, COL_LAST_CHECKED, COL_SERVER, COL_USER, COL_MSG = range(15)
 
+_SEARCH_COLUMNS = (COL_NAME, COL_CATEGORY, COL_STATUS, COL_SERVER, COL_USER, COL_MSG)
+# Display texts that mean "no data" for Exclude N/A, in every casing they appear in
+NA_DISPLAY_STRINGS = frozenset(variant for value in ("N/A", "INVALID", "NOT CHECKED", "NEVER")
+                               for variant in (value, value.lower(), value.title(), value.capitalize()))
+
+def entry_is_incomplete(entry, expiry_text):
+    """True if the expiry, trial, connection, last-checked or status cell of this row would show a
+    no-data sentinel; decided from the raw fields."""
+    # Never-checked rows are the usual reason, and they trip the first test; the set lookups go last
+    if not entry['last_checked_ts'] or entry['is_trial'] is None or entry['active_connections'] is None \
+            or entry['max_connections'] is None:
+        return True
+    status = entry['api_status']
+    return status is None or status in NA_DISPLAY_STRINGS or expiry_text in NA_DISPLAY_STRINGS
+
+def entry_search_blob(entry):
+    """The row's searchable columns, lowercased, joined by \\x1f (which a typed query never contains) and
+    UTF-8 encoded, so a search is a single bytes.__contains__ however wide the text's characters are."""
+    text = "\x1f".join(EntryTableModel.display_text(entry, col) or "" for col in _SEARCH_COLUMNS)
+    return text.lower().encode('utf-8')
+
+def join_search_blobs(blobs):
+    """(all blobs joined by \\n, start offset of each row plus the end) for entry_filter_mask()."""
+    starts = list(itertools.accumulate((len(blob) + 1 for blob in blobs), initial=0))
+    return b"\n".join(blobs), starts # A typed query never contains \n
+
+def entry_filter_mask(haystack, incomplete, count, search_bytes, exclude_incomplete):
+    """1/0 per row for "contains search_bytes and, if asked, is not incomplete".
+
+    All search blobs are scanned as one joined buffer (from join_search_blobs()), so the work per
+    filter is a handful of bytes.find calls in C rather than a Python-level test per row.
+    """
+    if search_bytes:
+        joined, starts = haystack
+        mask = bytearray(count)
+        pos = joined.find(search_bytes)
+        while pos != -1:
+            row = bisect.bisect_right(starts, pos) - 1
+            mask[row] = 1
+            pos = joined.find(search_bytes, starts[row + 1]) # Resume at the next row
+    else:
+        mask = bytearray(b"\x01") * count
+    if exclude_incomplete and count:
+        # Rows are 0/1 bytes, so one big-int AND-NOT clears every incomplete row at once
+        keep = int.from_bytes(mask, 'big') & ~int.from_bytes(incomplete, 'big')
+        mask = bytearray(keep.to_bytes(count, 'big'))
+    return mask
+
+class EntryFilterWorker(QObject):
+    """Computes entry filter masks on its own thread from an EntryTableModel.filter_snapshot()."""
+    mask_ready = Signal(int, object, int, object) # request id, mask, model version, haystack or None
+
+    def __init__(self):
+        super().__init__()
+        self.latest_request = 0 # Set from the GUI thread; anything older is stale and skipped
+
+    @Slot(int, object, object, bool)
+    def compute(self, request_id, snapshot, search_bytes, exclude_incomplete):
+        if request_id != self.latest_request: return
+        version, rows, blobs, incomplete, haystack = snapshot
+        if search_bytes and haystack is None:
+            haystack = join_search_blobs([blob if blob is not None else entry_search_blob(entry)
+                                          for entry, blob in zip(rows, blobs)])
+        mask = entry_filter_mask(haystack, incomplete, len(rows), search_bytes, exclude_incomplete)
+        self.mask_ready.emit(request_id, mask, version, haystack)
+
 class EntryFilterProxyModel(QSortFilterProxyModel):
+    _filter_requested = Signal(int, object, object, bool)
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self._search_text = ""
+        self._search_bytes = b""
         self._exclude_na = False
-        self._na_strings = {"N/A", "INVALID", "NOT CHECKED", "NEVER"}
+        self._accept_mask = None # Whole-table result from EntryTableModel.filter_mask() for the current filter
+        self._filter_thread = None # Started on the first search
+        self._filter_worker = None
+        self._filter_request = 0
+        self._pending_filter = ("", False) # (search text, exclude N/A) waiting on the worker
+
+    def setSourceModel(self, source):
+        old = self.sourceModel()
+        if old is not None:
+            old.dataChanged.disconnect(self._on_source_data_changed)
+            for signal in (old.rowsInserted, old.rowsRemoved, old.modelReset, old.layoutChanged):
+                signal.disconnect(self._on_source_changed)
+        # Connected before the base class hooks up, so the cache is dropped before Qt re-filters changed rows
+        if source is not None:
+            source.dataChanged.connect(self._on_source_data_changed)
+            for signal in (source.rowsInserted, source.rowsRemoved, source.modelReset, source.layoutChanged):
+                signal.connect(self._on_source_changed)
+        self._clear_cached_decisions()
+        super().setSourceModel(source)
+
+    def _clear_cached_decisions(self):
+        self._accept_mask = None
+
+    @Slot()
+    def _on_source_changed(self, *args):
+        self._clear_cached_decisions()
+
+    @Slot(QModelIndex, QModelIndex)
+    def _on_source_data_changed(self, top_left, bottom_right, roles=()):
+        """Re-decide only the changed rows, so a status update doesn't redo the whole-table mask."""
+        mask = self._accept_mask
+        if mask is not None:
+            model = self.sourceModel()
+            for row in range(top_left.row(), bottom_right.row() + 1):
+                mask[row] = ((not self._search_bytes or self._search_bytes in model.search_blob(row))
+                             and not (self._exclude_na and model.is_row_incomplete(row)))
+
+    def invalidate(self):
+        self._clear_cached_decisions()
+        super().invalidate()
+
+    def invalidateFilter(self):
+        self._clear_cached_decisions()
+        super().invalidateFilter()
 
     def set_search_text(self, text):
-        self._search_text = text.lower()
-        self.invalidate()
+        self._request_filter(text, self._pending_filter[1])
 
     def set_exclude_na(self, exclude):
+        self._request_filter(self._pending_filter[0], exclude)
+
+    def _request_filter(self, text, exclude):
+        """Apply a new filter. The mask is built on the filter thread and the view keeps showing the
+        previous result until it lands; clearing the filter applies at once."""
+        self._pending_filter = (text, exclude)
+        self._filter_request += 1
+        source = self.sourceModel()
+        if not (text or exclude):
+            self._apply_filter(text, exclude)
+            return
+        if self._filter_thread is None:
+            self._filter_thread = QThread()
+            self._filter_worker = EntryFilterWorker()
+            self._filter_worker.moveToThread(self._filter_thread)
+            self._filter_requested.connect(self._filter_worker.compute)
+            self._filter_worker.mask_ready.connect(self._on_mask_ready)
+            self._filter_thread.start()
+        self._filter_worker.latest_request = self._filter_request
+        self._filter_requested.emit(self._filter_request, source.filter_snapshot(),
+                                    text.lower().encode('utf-8'), exclude)
+
+    @Slot(int, object, int, object)
+    def _on_mask_ready(self, request_id, mask, version, haystack):
+        if request_id != self._filter_request: return # Superseded while it was being computed
+        source = self.sourceModel()
+        current = version == source.filter_version()
+        if current and haystack is not None:
+            source.adopt_search_haystack(version, haystack)
+        # If the model changed meanwhile, the mask is dropped and filterAcceptsRow() recomputes it
+        self._apply_filter(*self._pending_filter, mask=mask if current else None)
+
+    def _apply_filter(self, text, exclude, mask=None):
+        self._search_text = text.lower()
+        self._search_bytes = self._search_text.encode('utf-8') # Matched against EntryTableModel.search_blob()
         self._exclude_na = exclude
-        self.invalidate()
+        self.load_all_source_rows_if_needed()
+        self._accept_mask = mask
+        super().invalidate()
+
+    def shutdown(self):
+        """Stop the filter thread; called when the owning window closes."""
+        if self._filter_thread is not None:
+            self._filter_thread.quit()
+            self._filter_thread.wait()
+            self._filter_thread = None
+
+    def load_all_source_rows_if_needed(self):
+        """An active filter must see every row, not just the pages fetched so far."""
+        source = self.sourceModel()
+        if source is not None and (self._search_text or self._exclude_na):
+            source.fetch_all()
+
+    def _current_mask(self):
+        mask = self._accept_mask
+        if mask is None:
+            # One pass over the whole table; every later call for this filter is an index
+            mask = self._accept_mask = self.sourceModel().filter_mask(self._search_bytes, self._exclude_na)
+        return mask
+
+    def accepted_source_rows(self):
+        """Source rows that pass the filter, in view order, without a QModelIndex per row."""
+        count = self.sourceModel().rowCount()
+        if not self._search_text and not self._exclude_na:
+            return range(count)
+        return list(itertools.compress(range(count), self._current_mask()))
 
     def filterAcceptsRow(self, source_row, source_parent):
-        search_match = True
-        if self._search_text:
-            search_match = False
-            search_columns = [COL_NAME, COL_CATEGORY, COL_STATUS, COL_SERVER, COL_USER, COL_MSG]
-            for col in search_columns:
-                idx = self.sourceModel().index(source_row, col, source_parent)
-                data = self.sourceModel().data(idx)
-                if data and self._search_text in str(data).lower():
-                    search_match = True
-                    break
-        if not search_match:
-            return False
-
-        if self._exclude_na:
-            na_check_columns = [COL_EXPIRY, COL_TRIAL, COL_ACTIVE_CONN, COL_MAX_CONN, COL_LAST_CHECKED, COL_STATUS]
-            for col in na_check_columns:
-                idx = self.sourceModel().index(source_row, col, source_parent)
-                data_str = str(self.sourceModel().data(idx)).upper()
-                if data_str in self._na_strings:
-                    return False
-        return True
+        mask = self._accept_mask
+        if mask is not None:
+            return bool(mask[source_row])
+        if not self._search_text and not self._exclude_na:
+            return True
+        return bool(self._current_mask()[source_row])
 
 # =============================================================================
 # MAIN APPLICATION WINDOW
 # =============================================================================
+TABLE_RESIZE_SAMPLE_ROWS = 50
+ENTRY_SEARCH_DEBOUNCE_MS = 100
+# Header column -> get_all_entries() sort key; ordering happens in SQL, not in the proxy.
+COLUMN_SORT_KEYS = {
+    COL_ID: 'id', COL_NAME: 'name', COL_CATEGORY: 'category', COL_STATUS: 'api_status',
+    COL_CHANNELS: 'live_streams_count', COL_MOVIES: 'movies_count', COL_SERIES: 'series_count',
+    COL_EXPIRY: 'expiry_date_ts', COL_TRIAL: 'is_trial', COL_ACTIVE_CONN: 'active_connections',
+    COL_MAX_CONN: 'max_connections', COL_LAST_CHECKED: 'last_checked_ts', COL_SERVER: 'server',
+    COL_USER: 'user', COL_MSG: 'api_message',
+}
 COLUMN_HEADERS = ["ID", "Name", "Category", "API Status", "Channels", "Movies", "Series", "Expires", "Trial?", "Active", "Max", "Last Checked", "Server", "User / MAC", "Message"]
 
+def _count_display(value):
+    return str(value) if value is not None else "N/A"
+
+class EntryTableModel(QAbstractTableModel):
+    """Read-only table model backed directly by the sqlite3.Row list from get_all_entries().
+
+    Rows are handed to the view in pages of FETCH_BATCH_SIZE via canFetchMore/fetchMore,
+    and display strings are built on demand in data() instead of per-cell QStandardItems.
+    """
+    FETCH_BATCH_SIZE = 200
+
+    def __init__(self, status_color_provider, parent=None):
+        super().__init__(parent)
+        self._rows = []
+        self._row_of_id = {} # entry id -> row in _rows
+        self._expiry_text = [] # parallel to _rows, built once per reload
+        self._search_blob = [] # parallel to _rows, joined searchable columns built on first search
+        self._incomplete = bytearray() # parallel to _rows, 1 where Exclude N/A hides the row
+        self._haystack = None # join_search_blobs() of every row, built on first search
+        self._version = 0 # Bumped on every change to the rows, so an off-thread filter result can be checked
+        self._loaded = 0
+        self._status_color = status_color_provider # callable(status_text) -> QBrush
+
+    def set_rows(self, rows):
+        self.beginResetModel()
+        self._rows = list(rows)
+        self._row_of_id = {entry['id']: row for row, entry in enumerate(self._rows)}
+        self._expiry_text = format_timestamps_bulk([entry['expiry_date_ts'] for entry in self._rows])
+        self._search_blob = [None] * len(self._rows)
+        self._incomplete = bytearray(map(entry_is_incomplete, self._rows, self._expiry_text))
+        self._haystack = None
+        self._version += 1
+        self._loaded = min(len(self._rows), self.FETCH_BATCH_SIZE)
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._loaded
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMN_HEADERS)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._loaded < len(self._rows)
+
+    def fetchMore(self, parent=QModelIndex(), count=None):
+        if parent.isValid(): return
+        remaining = len(self._rows) - self._loaded
+        count = min(remaining, count if count is not None else self.FETCH_BATCH_SIZE)
+        if count <= 0: return
+        self.beginInsertRows(QModelIndex(), self._loaded, self._loaded + count - 1)
+        self._loaded += count
+        self.endInsertRows()
+
+    def fetch_all(self):
+        self.fetchMore(QModelIndex(), len(self._rows))
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole: return None
+        if orientation == Qt.Horizontal:
+            return COLUMN_HEADERS[section] if 0 <= section < len(COLUMN_HEADERS) else None
+        return section + 1
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole:
+            if index.column() == COL_EXPIRY: return self._expiry_text[index.row()]
+            return self.display_text(self._rows[index.row()], index.column())
+        if role == Qt.ForegroundRole:
+            if index.column() != COL_STATUS: return None
+            return self._status_color(self.display_text(self._rows[index.row()], COL_STATUS))
+        if role == Qt.UserRole:
+            return self._rows[index.row()]['id']
+        return None
+
+    def search_blob(self, row):
+        blob = self._search_blob[row]
+        if blob is None:
+            blob = self._search_blob[row] = entry_search_blob(self._rows[row])
+        return blob
+
+    @staticmethod
+    def display_text(entry, col):
+        if col == COL_ID: return str(entry['id'])
+        if col == COL_NAME: return entry['name']
+        if col == COL_CATEGORY: return entry['category']
+        if col == COL_STATUS: return entry['api_status'] if entry['api_status'] is not None else "Not Checked"
+        if col == COL_CHANNELS: return _count_display(entry['live_streams_count'])
+        if col == COL_MOVIES: return _count_display(entry['movies_count'])
+        if col == COL_SERIES: return _count_display(entry['series_count'])
+        if col == COL_EXPIRY: return format_timestamp_display(entry['expiry_date_ts'])
+        if col == COL_TRIAL: return format_trial_status_display(entry['is_trial'])
+        if col == COL_ACTIVE_CONN: return _count_display(entry['active_connections'])
+        if col == COL_MAX_CONN: return _count_display(entry['max_connections'])
+        if col == COL_LAST_CHECKED: return format_last_checked_display(entry['last_checked_ts'])
+        if col == COL_SERVER or col == COL_USER:
+            is_stalker = entry['account_type'] == 'stalker'
+            if col == COL_SERVER: value = entry['portal_url'] if is_stalker else entry['server_base_url']
+            else: value = entry['mac_address'] if is_stalker else entry['username']
+            return value or 'N/A'
+        if col == COL_MSG: return entry['api_message'] if entry['api_message'] is not None else ""
+        return None
+
+    def is_row_incomplete(self, row):
+        return self._incomplete[row]
+
+    def filter_mask(self, search_bytes, exclude_incomplete):
+        if search_bytes and self._haystack is None:
+            self._haystack = join_search_blobs([self.search_blob(row) for row in range(len(self._rows))])
+        return entry_filter_mask(self._haystack, self._incomplete, len(self._rows), search_bytes, exclude_incomplete)
+
+    def filter_snapshot(self):
+        """Copies of everything filter_mask() reads, for EntryFilterWorker to use off the GUI thread."""
+        return self._version, self._rows[:], self._search_blob[:], bytes(self._incomplete), self._haystack
+
+    def filter_version(self):
+        return self._version
+
+    def adopt_search_haystack(self, version, haystack):
+        """Keep a haystack the filter worker built, if the rows haven't changed since its snapshot."""
+        if version == self._version:
+            self._haystack = haystack
+
+    def entry_id_at(self, row):
+        return self._rows[row]['id']
+
+    def entry_at(self, row):
+        return self._rows[row]
+
+    def entry_with_id(self, entry_id):
+        row = self._row_of_id.get(entry_id)
+        return None if row is None else self._rows[row]
+
+    def reorder(self, entry_ids):
+        """Put the rows in the order of entry_ids (the same ids, re-sorted) as a layout change,
+        so the view keeps its selection and current row. Returns False if the ids don't match the rows."""
+        order = [self._row_of_id[entry_id] for entry_id in entry_ids if entry_id in self._row_of_id]
+        if len(order) != len(self._rows): return False
+        if order == list(range(len(self._rows))): return True
+        self.layoutAboutToBeChanged.emit()
+        new_row_of = {old_row: new_row for new_row, old_row in enumerate(order)}
+        old_indexes = self.persistentIndexList()
+        new_indexes = [self.index(new_row_of[index.row()], index.column()) for index in old_indexes]
+        self._rows = [self._rows[row] for row in order]
+        self._expiry_text = [self._expiry_text[row] for row in order]
+        self._search_blob = [self._search_blob[row] for row in order]
+        self._incomplete = bytearray(self._incomplete[row] for row in order)
+        self._row_of_id = {entry['id']: row for row, entry in enumerate(self._rows)}
+        self._haystack = None
+        self._version += 1
+        self.changePersistentIndexList(old_indexes, new_indexes)
+        self.layoutChanged.emit()
+        return True
+
+    def update_entry(self, entry):
+        """Swap in a freshly read row for the same id. Returns False if the id isn't in the model."""
+        row = self._row_of_id.get(entry['id'])
+        if row is None: return False
+        self._rows[row] = entry
+        self._expiry_text[row] = format_timestamp_display(entry['expiry_date_ts'])
+        self._search_blob[row] = None
+        self._haystack = None
+        self._version += 1
+        self._incomplete[row] = entry_is_incomplete(entry, self._expiry_text[row])
+        if row < self._loaded:
+            self.dataChanged.emit(self.index(row, 0), self.index(row, len(COLUMN_HEADERS) - 1))
+        return True
+
+    def remove_entries(self, entry_ids):
+        """Drop the rows for these ids with one beginRemoveRows per contiguous run. Returns how many went."""
+        rows = sorted({self._row_of_id[entry_id] for entry_id in entry_ids if entry_id in self._row_of_id}, reverse=True)
+        if not rows: return 0
+        runs = [] # [first, last], highest first so earlier runs keep their row numbers
+        for row in rows:
+            if runs and runs[-1][0] == row + 1: runs[-1][0] = row
+            else: runs.append([row, row])
+        for first, last in runs:
+            shown_last = min(last, self._loaded - 1) # Rows past _loaded were never reported to the view
+            if shown_last >= first: self.beginRemoveRows(QModelIndex(), first, shown_last)
+            del self._rows[first:last + 1], self._expiry_text[first:last + 1]
+            del self._search_blob[first:last + 1], self._incomplete[first:last + 1]
+            if shown_last >= first:
+                self._loaded -= shown_last - first + 1
+                self.endRemoveRows()
+        self._row_of_id = {entry['id']: row for row, entry in enumerate(self._rows)}
+        self._haystack = None
+        self._version += 1
+        return len(rows)
+
+    def refresh_status_colors(self):
+        if self._loaded:
+            self.dataChanged.emit(self.index(0, COL_STATUS), self.index(self._loaded - 1, COL_STATUS))
+
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -1767,6 +3013,15 @@ class MainWindow(QMainWindow):
         self.api_worker = None
         self.api_thread = None
         self._is_checking_api = False
+        self.import_thread = None
+        self.import_worker = None
+        # Checker results are buffered here and written in batches.
+        self._pending_status_results = []
+        self._entry_dialog = None # Reused across Add/Edit opens, see entry_dialog()
+        self._status_flush_timer = QTimer(self)
+        self._status_flush_timer.setSingleShot(True)
+        self._status_flush_timer.setInterval(STATUS_FLUSH_INTERVAL_MS)
+        self._status_flush_timer.timeout.connect(self.flush_pending_status_updates)
         self.setup_ui()
         self.load_entries_to_table()
         self.update_category_filter_combo()
@@ -1871,8 +3126,8 @@ class MainWindow(QMainWindow):
         main_layout.addLayout(filter_controls_layout)
 
         self.table_view = QTableView()
-        self.table_model = QStandardItemModel(0, len(COLUMN_HEADERS))
-        self.table_model.setHorizontalHeaderLabels(COLUMN_HEADERS)
+        self._status_brushes = {} # status text -> QBrush for the current theme
+        self.table_model = EntryTableModel(self.status_color, self)
         self.proxy_model = EntryFilterProxyModel(self)
         self.proxy_model.setSourceModel(self.table_model)
         self.table_view.setModel(self.proxy_model)
@@ -1880,9 +3135,16 @@ class MainWindow(QMainWindow):
         self.table_view.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.table_view.setSelectionMode(QAbstractItemView.ExtendedSelection)
         self.table_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
-        self.table_view.setSortingEnabled(True)
-        self.table_view.sortByColumn(COL_NAME, Qt.AscendingOrder)
+        # Sorting is done by get_all_entries(); the header only records the requested order.
+        self.table_view.setSortingEnabled(False)
+        self.sort_column = COL_NAME
+        self.sort_order = Qt.AscendingOrder
+        # Uniform row heights: the view never has to ask rows for a size hint.
+        vertical_header = self.table_view.verticalHeader()
+        vertical_header.setSectionResizeMode(QHeaderView.Fixed)
         header = self.table_view.horizontalHeader()
+        # ResizeToContents columns measure a sample of rows instead of every row on each layout pass.
+        header.setResizeContentsPrecision(TABLE_RESIZE_SAMPLE_ROWS)
         header.setSectionResizeMode(COL_ID, QHeaderView.ResizeToContents)
         header.setSectionResizeMode(COL_NAME, QHeaderView.Interactive)
         self.table_view.setColumnWidth(COL_NAME, 200)
@@ -1898,8 +3160,13 @@ class MainWindow(QMainWindow):
         header.setSectionResizeMode(COL_LAST_CHECKED, QHeaderView.ResizeToContents)
         header.setSectionResizeMode(COL_SERVER, QHeaderView.Interactive)
         self.table_view.setColumnWidth(COL_SERVER, 150)
-        header.setSectionResizeMode(COL_USER, QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(COL_USER, QHeaderView.Interactive) # Usernames/MACs vary per row; no re-measuring
+        self.table_view.setColumnWidth(COL_USER, 150)
         header.setSectionResizeMode(COL_MSG, QHeaderView.Stretch)
+        header.setSectionsClickable(True)
+        header.setSortIndicatorShown(True)
+        header.setSortIndicator(self.sort_column, self.sort_order)
+        header.sortIndicatorChanged.connect(self.on_sort_indicator_changed)
         main_layout.addWidget(self.table_view)
         self.setCentralWidget(main_widget)
         self.status_bar = QStatusBar()
@@ -1926,24 +3193,43 @@ class MainWindow(QMainWindow):
         self.table_view.doubleClicked.connect(self.on_table_double_clicked)
         self.table_view.setContextMenuPolicy(Qt.CustomContextMenu)
         self.table_view.customContextMenuRequested.connect(self.open_context_menu)
-        self.category_filter_combo.currentTextChanged.connect(self.category_filter_changed)
-        self.search_edit.textChanged.connect(self.on_search_text_changed)
+        self._context_menu = None # Built on the first right-click
+        self.category_filter_combo.currentIndexChanged.connect(self.category_filter_changed)
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(ENTRY_SEARCH_DEBOUNCE_MS)
+        self._search_timer.timeout.connect(lambda: self.on_search_text_changed(self.search_edit.text()))
+        self.search_edit.textChanged.connect(self._search_timer.start)
         self.exclude_na_button.toggled.connect(self.on_exclude_na_toggled)
 
         self.table_view.selectionModel().selectionChanged.connect(self.update_action_button_states)
         self.table_view.selectionModel().currentChanged.connect(self.update_action_button_states)
 
     def update_category_filter_combo(self):
-        cur_sel = self.category_filter_combo.currentText(); self.category_filter_combo.blockSignals(True)
-        self.category_filter_combo.clear(); self.category_filter_combo.addItem("All Categories")
-        try: self.category_filter_combo.addItems(get_all_categories())
-        except Exception as e: logging.error(f"Failed to populate category filter: {e}")
-        idx = self.category_filter_combo.findText(cur_sel); self.category_filter_combo.setCurrentIndex(idx if idx != -1 else 0)
+        # Items show "Name (count)"; the bare category name is kept as item data.
+        cur_sel = self.current_category_filter; self.category_filter_combo.blockSignals(True)
+        self.category_filter_combo.clear()
+        try:
+            counts = get_category_counts()
+            self.category_filter_combo.addItem(f"All Categories ({sum(counts.values())})", "All Categories")
+            for name in get_all_categories_cached():
+                self.category_filter_combo.addItem(f"{name} ({counts.get(name, 0)})", name)
+        except Exception as e:
+            logging.error("Failed to populate category filter: %s", e)
+            if self.category_filter_combo.count() == 0: self.category_filter_combo.addItem("All Categories", "All Categories")
+        idx = self.category_filter_combo.findData(cur_sel); self.category_filter_combo.setCurrentIndex(idx if idx != -1 else 0)
         self.category_filter_combo.blockSignals(False)
+        if idx == -1 and cur_sel != "All Categories": self.category_filter_changed(0)
 
-    @Slot(str)
-    def category_filter_changed(self, cat_name):
-        self.current_category_filter = cat_name;
+    @Slot(int)
+    def category_filter_changed(self, index):
+        self.current_category_filter = self.category_filter_combo.itemData(index) or "All Categories"
+        self.load_entries_to_table()
+
+    @Slot(int, Qt.SortOrder)
+    def on_sort_indicator_changed(self, column, order):
+        if column not in COLUMN_SORT_KEYS: return
+        self.sort_column = column; self.sort_order = order
         self.load_entries_to_table()
 
     @Slot(str)
@@ -1955,49 +3241,27 @@ class MainWindow(QMainWindow):
         self.proxy_model.set_exclude_na(checked)
 
     def load_entries_to_table(self):
-        self.table_model.removeRows(0, self.table_model.rowCount())
         try:
-            for row_data in get_all_entries(category_filter=self.current_category_filter): self.table_model.appendRow(self.create_row_items(row_data))
-        except Exception as e: logging.error(f"Error loading entries: {e}"); QMessageBox.critical(self, "Load Error", f"Could not load: {e}")
-        self.proxy_model.invalidate()
-
-    def create_row_items(self, entry_data):
-        items = []; id_item = QStandardItem(str(entry_data['id'])); id_item.setData(entry_data['id'], Qt.UserRole); items.append(id_item)
-        items.append(QStandardItem(entry_data['name'])); items.append(QStandardItem(entry_data['category']))
-        status_val = entry_data['api_status'] if entry_data['api_status'] is not None else "Not Checked"
-        status_item = QStandardItem(status_val); self.apply_status_coloring(status_item, status_val); items.append(status_item)
-        items.append(QStandardItem(str(entry_data['live_streams_count']) if entry_data['live_streams_count'] is not None else "N/A"))
-        items.append(QStandardItem(str(entry_data['movies_count']) if entry_data['movies_count'] is not None else "N/A"))
-        items.append(QStandardItem(str(entry_data['series_count']) if entry_data['series_count'] is not None else "N/A"))
-        items.append(QStandardItem(format_timestamp_display(entry_data['expiry_date_ts'])))
-        items.append(QStandardItem(format_trial_status_display(entry_data['is_trial'])))
-        active_c = entry_data['active_connections']; items.append(QStandardItem(str(active_c) if active_c is not None else "N/A"))
-        max_c = entry_data['max_connections']; items.append(QStandardItem(str(max_c) if max_c is not None else "N/A"))
-        last_chk_raw = entry_data['last_checked_at']; last_chk_disp = "Never"
-        if last_chk_raw:
-            try:
-                dt_utc = QDateTime.fromString(last_chk_raw.split('.')[0], Qt.ISODate).toUTC()
-                if not dt_utc.isValid() : dt_utc = QDateTime.fromString(last_chk_raw, Qt.ISODateWithMs).toUTC()
-                dt_local = dt_utc.toLocalTime(); last_chk_disp = dt_local.toString("yyyy-MM-dd hh:mm")
-            except Exception as e: logging.warning(f"Error parsing last_checked_at '{last_chk_raw}': {e}")
-        items.append(QStandardItem(last_chk_disp))
-
-        # entry_data is an sqlite3.Row object. Access columns using dictionary-style access.
-        # The 'account_type' column should exist due to migrations, defaulting to 'xc'.
-        account_type = entry_data['account_type'] if entry_data['account_type'] is not None else 'xc'
-
-        if account_type == 'stalker':
-            items.append(QStandardItem(entry_data['portal_url'] or 'N/A')) # Server column
-            items.append(QStandardItem(entry_data['mac_address'] or 'N/A')) # Username column, now User/MAC
-        else: # XC or if somehow account_type is None and defaulted to 'xc'
-            items.append(QStandardItem(entry_data['server_base_url'] or 'N/A'))
-            items.append(QStandardItem(entry_data['username'] or 'N/A'))
+            rows = get_all_entries(category_filter=self.current_category_filter, sort_key=COLUMN_SORT_KEYS[self.sort_column],
+                                   descending=self.sort_order == Qt.DescendingOrder)
+        except Exception as e:
+            rows = []
+            logging.error("Error loading entries: %s", e); QMessageBox.critical(self, "Load Error", f"Could not load: {e}")
+        # The model reset re-filters the proxy by itself; the selection it clears is reported once, below
+        blocker = QSignalBlocker(self.table_view.selectionModel())
+        self.table_model.set_rows(rows)
+        self.proxy_model.load_all_source_rows_if_needed()
+        blocker.unblock()
+        self.update_action_button_states()
 
-        api_msg = entry_data['api_message'] if entry_data['api_message'] is not None else ""
-        items.append(QStandardItem(api_msg))
-        return items
+    def status_color(self, status_text):
+        """Foreground brush for a status text; built once per distinct text and theme."""
+        brush = self._status_brushes.get(status_text)
+        if brush is None:
+            brush = self._status_brushes[status_text] = QBrush(self._status_qcolor(status_text))
+        return brush
 
-    def apply_status_coloring(self, item, status_text):
+    def _status_qcolor(self, status_text):
         s_lower = str(status_text).lower()
         # Default color will be the current text color from the stylesheet
         # This ensures that if no specific rule matches, it uses the theme's default text color.
@@ -2020,7 +3284,7 @@ class MainWindow(QMainWindow):
             elif "error" in s_lower or "failed" in s_lower and "auth failed" not in s_lower : color = QColor("magenta")
             else: color = QColor("gray") # Grey for "Not Checked" or other statuses in light mode
 
-        item.setForeground(color)
+        return color
 
     @Slot()
     def update_action_button_states(self):
@@ -2029,20 +3293,21 @@ class MainWindow(QMainWindow):
         selected_row_count = len(selection_model.selectedRows(0))
 
         not_checking = not self._is_checking_api
+        not_importing = self.import_thread is None # An import shares the progress bar and writes entries
 
         # Edit/delete/re-check stay locked during a check to avoid write conflicts
         self.edit_button.setEnabled(selected_row_count == 1 and not_checking)
         self.delete_button.setEnabled(has_selection and not_checking)
         self.bulk_edit_button.setEnabled(has_selection and not_checking)
-        self.check_selected_button.setEnabled(has_selection and not_checking)
-        self.check_all_button.setEnabled(self.proxy_model.rowCount() > 0 and not_checking)
+        self.check_selected_button.setEnabled(has_selection and not_checking and not_importing)
+        self.check_all_button.setEnabled(self.proxy_model.rowCount() > 0 and not_checking and not_importing)
 
         # Read-only actions are always available
         self.browse_button.setEnabled(selected_row_count == 1)
         self.export_txt_button.setEnabled(has_selection)
         self.add_button.setEnabled(True)
         self.import_url_button.setEnabled(not_checking)
-        self.import_file_button.setEnabled(not_checking)
+        self.import_file_button.setEnabled(not_checking and not_importing)
         self.manage_categories_button.setEnabled(True)
         self.category_filter_combo.setEnabled(True)
         self.search_edit.setEnabled(True)
@@ -2053,9 +3318,17 @@ class MainWindow(QMainWindow):
         self.export_clipboard_button.setEnabled(is_valid_current_item)
 
 
+    def entry_dialog(self, entry_id=None):
+        """The window's single EntryDialog, reset for ``entry_id`` (None for Add)."""
+        if self._entry_dialog is None:
+            self._entry_dialog = EntryDialog(entry_id=entry_id, parent=self)
+        else:
+            self._entry_dialog.reset(entry_id)
+        return self._entry_dialog
+
     @Slot()
     def add_entry_action(self):
-        diag = EntryDialog(parent=self)
+        diag = self.entry_dialog()
         if diag.exec(): self.load_entries_to_table(); self.update_category_filter_combo()
 
     @Slot()
@@ -2067,9 +3340,8 @@ class MainWindow(QMainWindow):
             current_proxy_index = sel_proxied[0]
 
         src_idx = self.proxy_model.mapToSource(current_proxy_index)
-        entry_id_item = self.table_model.itemFromIndex(src_idx.siblingAtColumn(COL_ID))
-        if not entry_id_item: return
-        entry_id = entry_id_item.data(Qt.UserRole)
+        if not src_idx.isValid(): return
+        entry_id = self.table_model.entry_id_at(src_idx.row())
 
         entry_data = get_entry_by_id(entry_id)
         if not entry_data:
@@ -2089,9 +3361,8 @@ class MainWindow(QMainWindow):
         if not index.isValid(): return
 
         src_idx = self.proxy_model.mapToSource(index)
-        entry_id_item = self.table_model.itemFromIndex(src_idx.siblingAtColumn(COL_ID))
-        if not entry_id_item: return
-        entry_id = entry_id_item.data(Qt.UserRole)
+        if not src_idx.isValid(): return
+        entry_id = self.table_model.entry_id_at(src_idx.row())
 
         entry_data = get_entry_by_id(entry_id)
         if not entry_data: return
@@ -2108,41 +3379,29 @@ class MainWindow(QMainWindow):
 
     @Slot(object) # Using object/QPoint
     def open_context_menu(self, position):
-        menu = QMenu()
-
-        browse_action = QAction("Browse / Play", self)
-        browse_action.triggered.connect(self.browse_entry_action)
-        menu.addAction(browse_action)
-
-        edit_action = QAction("Edit", self)
-        edit_action.triggered.connect(self.edit_entry_action)
-        menu.addAction(edit_action)
-
-        menu.addSeparator()
-
-        check_action = QAction("Check Status", self)
-        check_action.triggered.connect(self.check_selected_entries_action)
-        menu.addAction(check_action)
-
-        copy_action = QAction("Copy Link", self)
-        copy_action.triggered.connect(self.export_current_to_clipboard)
-        menu.addAction(copy_action)
-
-        menu.addSeparator()
-
-        delete_action = QAction("Delete", self)
-        delete_action.triggered.connect(self.delete_entry_action)
-        menu.addAction(delete_action)
+        if self._context_menu is None:
+            self._build_context_menu() # Once; later right-clicks only re-enable the actions
 
         # Disable actions based on selection similar to buttons
         selected_count = len(self.table_view.selectionModel().selectedRows())
-        browse_action.setEnabled(selected_count == 1)
-        edit_action.setEnabled(selected_count == 1)
-        check_action.setEnabled(selected_count > 0)
-        copy_action.setEnabled(selected_count == 1)
-        delete_action.setEnabled(selected_count > 0)
-
-        menu.exec(self.table_view.mapToGlobal(position))
+        self._ctx_browse_action.setEnabled(selected_count == 1)
+        self._ctx_edit_action.setEnabled(selected_count == 1)
+        self._ctx_check_action.setEnabled(selected_count > 0)
+        self._ctx_copy_action.setEnabled(selected_count == 1)
+        self._ctx_delete_action.setEnabled(selected_count > 0)
+
+        # The position is relative to the viewport, below the header
+        self._context_menu.exec(self.table_view.viewport().mapToGlobal(position))
+
+    def _build_context_menu(self):
+        menu = self._context_menu = QMenu(self)
+        self._ctx_browse_action = menu.addAction("Browse / Play", self.browse_entry_action)
+        self._ctx_edit_action = menu.addAction("Edit", self.edit_entry_action)
+        menu.addSeparator()
+        self._ctx_check_action = menu.addAction("Check Status", self.check_selected_entries_action)
+        self._ctx_copy_action = menu.addAction("Copy Link", self.export_current_to_clipboard)
+        menu.addSeparator()
+        self._ctx_delete_action = menu.addAction("Delete", self.delete_entry_action)
 
     @Slot()
     def edit_entry_action(self):
@@ -2153,12 +3412,11 @@ class MainWindow(QMainWindow):
             current_proxy_index = sel_proxied[0]
 
         src_idx = self.proxy_model.mapToSource(current_proxy_index)
-        entry_id_item = self.table_model.itemFromIndex(src_idx.siblingAtColumn(COL_ID))
-        if not entry_id_item: return
-        entry_id = entry_id_item.data(Qt.UserRole)
+        if not src_idx.isValid(): return
+        entry_id = self.table_model.entry_id_at(src_idx.row())
 
         # Always open the Edit Dialog
-        diag = EntryDialog(entry_id=entry_id, parent=self)
+        diag = self.entry_dialog(entry_id)
         if diag.exec(): self.refresh_row_by_id(entry_id); self.update_category_filter_combo()
 
     @Slot()
@@ -2172,12 +3430,11 @@ class MainWindow(QMainWindow):
         if dialog.exec():
             new_category = dialog.get_selected_category()
             try:
-                for entry_id in selected_ids:
-                    update_entry_category(entry_id, new_category)
-                self.load_entries_to_table()
+                bulk_update_category(selected_ids, new_category)
+                self.refresh_rows(get_entries_by_ids(selected_ids)); self.update_category_filter_combo()
                 QMessageBox.information(self, "Success", f"{len(selected_ids)} entries have been moved to the '{new_category}' category.")
             except Exception as e:
-                logging.error(f"Error bulk updating categories: {e}")
+                logging.error("Error bulk updating categories: %s", e)
                 QMessageBox.critical(self, "Database Error", f"Could not update categories: {e}")
 
     @Slot()
@@ -2186,55 +3443,23 @@ class MainWindow(QMainWindow):
         if not sel_proxied: return
         reply = QMessageBox.question(self, "Confirm Delete", f"Delete {len(sel_proxied)} selected entry(s)?", QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
         if reply == QMessageBox.Yes:
-            ids_del = []
+            entries_del = []
             for proxy_idx in sel_proxied:
                 src_idx = self.proxy_model.mapToSource(proxy_idx)
-                id_item = self.table_model.itemFromIndex(src_idx.siblingAtColumn(COL_ID))
-                if id_item: ids_del.append(id_item.data(Qt.UserRole))
+                if src_idx.isValid(): entries_del.append(self.table_model.entry_at(src_idx.row()))
 
-            for entry_id in ids_del:
-                try: delete_entry(entry_id)
-                except Exception as e: QMessageBox.warning(self, "Delete Error", f"Could not delete ID {entry_id}: {e}")
-            self.load_entries_to_table()
+            try: delete_entries([entry['id'] for entry in entries_del])
+            except Exception as e:
+                QMessageBox.warning(self, "Delete Error", f"Could not delete the selected entries: {e}"); return
+            for entry in entries_del: invalidate_entry_caches(entry)
+            self.table_model.remove_entries([entry['id'] for entry in entries_del]); self.update_category_filter_combo()
 
     @Slot()
     def delete_duplicates_action(self):
-        duplicates_to_delete = []
         try:
-            conn = get_db_connection()
-            # Use window functions to identify duplicates directly in SQL.
-            # Logic: Partition by key credentials and order by last_checked_at (latest first) then ID.
-            # Records with row_number > 1 are duplicates to be removed.
-            query = """
-                SELECT id FROM (
-                    SELECT id,
-                           ROW_NUMBER() OVER (
-                               PARTITION BY
-                                   CASE
-                                       WHEN COALESCE(account_type, 'xc') = 'stalker' THEN portal_url
-                                       ELSE server_base_url
-                                   END,
-                                   CASE
-                                       WHEN COALESCE(account_type, 'xc') = 'stalker' THEN mac_address
-                                       ELSE username
-                                   END,
-                                   CASE
-                                       WHEN COALESCE(account_type, 'xc') = 'stalker' THEN ''
-                                       ELSE password
-                                   END,
-                                   COALESCE(account_type, 'xc')
-                               ORDER BY
-                                   last_checked_at DESC,
-                                   id ASC
-                           ) as rn
-                    FROM entries
-                ) WHERE rn > 1
-            """
-            rows = conn.execute(query).fetchall()
-            duplicates_to_delete = [row['id'] for row in rows]
-            conn.close()
+            duplicates_to_delete = get_duplicate_ids()
         except Exception as e:
-            logging.error(f"Error finding duplicates in DB: {e}")
+            logging.error("Error finding duplicates in DB: %s", e)
             QMessageBox.critical(self, "Database Error", f"Could not retrieve entries to check for duplicates: {e}")
             return
 
@@ -2247,16 +3472,15 @@ class MainWindow(QMainWindow):
                                      QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
 
         if reply == QMessageBox.Yes:
-            deleted_count = 0
-            for entry_id in duplicates_to_delete:
-                try:
-                    delete_entry(entry_id)
-                    deleted_count += 1
-                except Exception as e:
-                    logging.error(f"Could not delete duplicate entry with ID {entry_id}: {e}")
+            try:
+                delete_entries(duplicates_to_delete)
+            except Exception as e:
+                logging.error("Could not delete %s duplicate entries: %s", len(duplicates_to_delete), e)
+                QMessageBox.critical(self, "Database Error", f"Could not delete duplicate entries: {e}")
+                return
 
-            QMessageBox.information(self, "Deletion Complete", f"Successfully deleted {deleted_count} duplicate entries.")
-            self.load_entries_to_table()
+            QMessageBox.information(self, "Deletion Complete", f"Successfully deleted {len(duplicates_to_delete)} duplicate entries.")
+            self.table_model.remove_entries(duplicates_to_delete); self.update_category_filter_combo()
 
     @Slot()
     def manage_categories_action(self):
@@ -2273,118 +3497,58 @@ class MainWindow(QMainWindow):
 
     @Slot()
     def import_from_file_action(self):
+        if self.import_thread is not None:
+            QMessageBox.warning(self, "Busy", "A file import is already in progress.")
+            return
+        if self._is_checking_api:
+            QMessageBox.warning(self, "Busy", "API check in progress. Import once it has finished.")
+            return
         file_path, _ = QFileDialog.getOpenFileName(self, "Select Text File with URLs", "", "Text Files (*.txt);;All Files (*)")
         if not file_path: return
         options_dialog = BatchImportOptionsDialog(parent=self)
         if not options_dialog.exec(): return
         default_category = options_dialog.get_selected_category()
-        imported_count = 0
-        failed_count = 0
-
-        current_stalker_portal_url_for_mac_list = None
-        mac_pattern = re.compile(r"^([0-9A-Fa-f]{2}[:-]){5}([0-9A-Fa-f]{2})$")
-
-        try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                for line_num, line in enumerate(f, 1):
-                    line_content = line.strip()
-                    if not line_content or line_content.startswith('#'):
-                        continue
-
-                    is_stalker_credential_string = line_content.startswith("stalker_portal:")
-                    is_xc_link = "get.php?" in line_content
-                    # Check for MAC pattern first, as URLs can be short and might be misidentified by simple http check alone
-                    is_potential_mac = mac_pattern.fullmatch(line_content) is not None # Use fullmatch for MAC
-
-                    # A line is a potential portal URL if it starts with http/https, is NOT an XC link, AND NOT a stalker credential string
-                    is_potential_portal_url = (line_content.startswith("http://") or line_content.startswith("https://")) \
-                                               and not is_xc_link and not is_stalker_credential_string
-
-                    if is_stalker_credential_string:
-                        current_stalker_portal_url_for_mac_list = None # Reset context
-                        try:
-                            parts = line_content.split(',')
-                            if len(parts) < 2: raise ValueError("Malformed stalker string, missing comma.")
-                            portal_part_full = parts[0].strip()
-                            mac_part_full = parts[1].strip()
-
-                            if not portal_part_full.startswith("stalker_portal:") or not mac_part_full.startswith("mac:"):
-                                raise ValueError("Malformed stalker string, missing prefixes.")
-
-                            portal_url = portal_part_full.replace("stalker_portal:", "").strip()
-                            mac_address = mac_part_full.replace("mac:", "").strip().upper()
-
-                            if not (portal_url.startswith("http://") or portal_url.startswith("https://")):
-                                logging.warning(f"Batch Import: Invalid Stalker portal URL in string on line {line_num}: {portal_url}"); failed_count += 1; continue
-                            if not mac_pattern.fullmatch(mac_address): # Re-check MAC after parsing
-                                logging.warning(f"Batch Import: Invalid Stalker MAC address in string on line {line_num}: {mac_address}"); failed_count += 1; continue
-
-                            parsed_p_url = urlparse(portal_url)
-                            host = parsed_p_url.hostname or "stalker_host"
-                            display_name = f"{host}_{mac_address.replace(':', '')}_L{line_num}"
-                            server_base_url = f"{parsed_p_url.scheme}://{parsed_p_url.netloc}" if parsed_p_url.scheme and parsed_p_url.netloc else portal_url
-                            add_entry(display_name, default_category, server_base_url, "", "", account_type='stalker', mac_address=mac_address, portal_url=portal_url)
-                            imported_count += 1
-                            logging.info(f"Batch Import: Successfully imported Stalker credential string from line {line_num}")
-                        except Exception as e_stalker_str:
-                            logging.error(f"Batch Import: Error processing Stalker credential string on line {line_num} ('{line_content}'): {e_stalker_str}"); failed_count += 1
-
-                    elif is_xc_link:
-                        current_stalker_portal_url_for_mac_list = None # Reset context
-                        parsed_info = parse_get_php_url(line_content)
-                        if parsed_info and not parsed_info.get('error'):
-                            try:
-                                host = urlparse(parsed_info['server_base_url']).hostname or "host"
-                                display_name = f"{host}_{parsed_info['username']}_L{line_num}"
-                                add_entry(display_name, default_category, parsed_info['server_base_url'], parsed_info['username'], parsed_info['password'])
-                                imported_count += 1
-                            except Exception as db_e: logging.error(f"Batch Import: DB error for XC URL on line {line_num} ('{line_content}'): {db_e}"); failed_count += 1
-                        else:
-                            logging.warning(f"Batch Import: Failed to parse XC URL on line {line_num}: {line_content} - {parsed_info.get('error', 'Unknown') if parsed_info else 'None'}"); failed_count += 1
-
-                    elif is_potential_portal_url: # Must be checked AFTER specific formats (XC, stalker_portal:)
-                        parsed_val_url = urlparse(line_content)
-                        if parsed_val_url.scheme and parsed_val_url.netloc: # Basic validation
-                            current_stalker_portal_url_for_mac_list = line_content
-                            logging.info(f"Batch Import: Set current Stalker portal URL for subsequent MACs to: {current_stalker_portal_url_for_mac_list} (from line {line_num})")
-                        else:
-                            logging.warning(f"Batch Import: Skipped potential URL (malformed or unsupported) on line {line_num}: {line_content}")
-                            # current_stalker_portal_url_for_mac_list = None # Keep previous context or reset? Let's keep for now.
-                            failed_count +=1
+        self.progress_bar.setRange(0, max(os.path.getsize(file_path), 1))
+        self.progress_bar.setValue(0)
+        self.progress_bar.setFormat("Importing... %p%")
+        self.progress_bar.setVisible(True)
+
+        self.import_worker = ImportWorker(file_path, default_category)
+        self.import_thread = QThread()
+        self.import_worker.moveToThread(self.import_thread)
+        self.import_thread.started.connect(self.import_worker.run)
+        self.import_worker.progress.connect(self.update_progress_bar_values)
+        self.import_worker.imported.connect(self.on_import_finished)
+        self.import_worker.error_occurred.connect(self.on_import_error)
+        self.import_worker.finished.connect(self.import_thread.quit)
+        self.import_worker.finished.connect(self.import_worker.deleteLater)
+        self.import_thread.finished.connect(self._clear_import_thread)
+        self.import_thread.start()
+        self.update_action_button_states()
 
-                    elif is_potential_mac and current_stalker_portal_url_for_mac_list:
-                        mac_address = line_content.strip().upper() # Already validated by is_potential_mac basically
-                        portal_url = current_stalker_portal_url_for_mac_list
-                        try:
-                            parsed_p_url = urlparse(portal_url)
-                            host = parsed_p_url.hostname or "stalker_host"
-                            display_name = f"{host}_{mac_address.replace(':', '')}_L{line_num}"
-                            server_base_url = f"{parsed_p_url.scheme}://{parsed_p_url.netloc}" if parsed_p_url.scheme and parsed_p_url.netloc else portal_url
-                            add_entry(display_name, default_category, server_base_url, "", "", account_type='stalker', mac_address=mac_address, portal_url=portal_url)
-                            imported_count += 1
-                            logging.info(f"Batch Import: Successfully imported Stalker MAC {mac_address} for portal {portal_url} from line {line_num}")
-                        except Exception as e_mac_list:
-                            logging.error(f"Batch Import: Error processing MAC {mac_address} for portal {portal_url} on line {line_num}: {e_mac_list}"); failed_count += 1
+    @Slot(int, int)
+    def on_import_finished(self, imported_count, failed_count):
+        QMessageBox.information(self, "Batch Import Complete", f"Imported: {imported_count}\nFailed/Skipped: {failed_count}\nSee log for details.")
+        if imported_count > 0: self.load_entries_to_table(); self.update_category_filter_combo()
 
-                    else:
-                        if is_potential_mac and not current_stalker_portal_url_for_mac_list:
-                            logging.warning(f"Batch Import: Skipped MAC address {line_content} on line {line_num} as no Stalker Portal URL was previously defined in a block.")
-                        else:
-                            logging.warning(f"Batch Import: Skipped unrecognized line {line_num}: {line_content[:100]}...")
-                        failed_count += 1
+    @Slot(str)
+    def on_import_error(self, message):
+        QMessageBox.critical(self, "Import Error", message)
 
-            QMessageBox.information(self, "Batch Import Complete", f"Imported: {imported_count}\nFailed/Skipped: {failed_count}\nSee log for details.")
-            if imported_count > 0: self.load_entries_to_table(); self.update_category_filter_combo()
-        except IOError as e: logging.error(f"Error reading import file '{file_path}': {e}"); QMessageBox.critical(self, "File Error", f"Could not read file: {e}")
-        except Exception as e_gen: logging.error(f"Unexpected error during batch import: {e_gen}"); QMessageBox.critical(self, "Import Error", f"Unexpected error: {e_gen}")
+    @Slot()
+    def _clear_import_thread(self):
+        if self.import_thread:
+            self.import_thread.wait(); self.import_thread.deleteLater()
+        self.import_thread = None; self.import_worker = None
+        self.progress_bar.setVisible(False)
+        self.update_action_button_states()
 
     def get_entry_data_for_export(self, proxy_index):
         if not proxy_index.isValid(): return None
         source_index = self.proxy_model.mapToSource(proxy_index)
-        entry_id_item = self.table_model.itemFromIndex(source_index.siblingAtColumn(COL_ID))
-        if not entry_id_item: return None
+        if not source_index.isValid(): return None
 
-        entry_id = entry_id_item.data(Qt.UserRole)
+        entry_id = self.table_model.entry_id_at(source_index.row())
         entry = get_entry_by_id(entry_id) # entry is an sqlite3.Row
         if entry:
             account_type = entry['account_type'] if entry['account_type'] is not None else 'xc'
@@ -2393,7 +3557,8 @@ class MainWindow(QMainWindow):
                 mac_address = entry['mac_address'] or ""
                 return f"stalker_portal:{portal_url},mac:{mac_address}"
             else: # XC
-                return f"{entry['server_base_url']}/get.php?username={entry['username']}&password={entry['password']}&type=m3u_plus&output=ts"
+                query = urlencode({'username': entry['username'], 'password': entry['password'], 'type': 'm3u_plus', 'output': 'ts'})
+                return f"{entry['server_base_url']}/get.php?{query}"
         return None
 
     @Slot()
@@ -2405,10 +3570,9 @@ class MainWindow(QMainWindow):
 
             # Determine message based on what was copied
             source_index = self.proxy_model.mapToSource(current_proxy_index)
-            entry_id_item = self.table_model.itemFromIndex(source_index.siblingAtColumn(COL_ID))
             message = "Data copied to clipboard."
-            if entry_id_item:
-                entry_id = entry_id_item.data(Qt.UserRole)
+            if source_index.isValid():
+                entry_id = self.table_model.entry_id_at(source_index.row())
                 db_entry = get_entry_by_id(entry_id)
                 if db_entry:
                     account_type = db_entry['account_type'] if db_entry['account_type'] is not None else 'xc'
@@ -2444,7 +3608,7 @@ class MainWindow(QMainWindow):
                 self.status_bar.showMessage(f"{len(m3u_links)} links exported to {os.path.basename(file_path)}.", 5000)
                 QMessageBox.information(self, "Export Successful", f"{len(m3u_links)} M3U links exported to:\n{file_path}")
             except IOError as e:
-                logging.error(f"Error writing export file '{file_path}': {e}")
+                logging.error("Error writing export file '%s': %s", file_path, e)
                 QMessageBox.critical(self, "File Error", f"Could not write to file: {e}")
 
 
@@ -2455,23 +3619,19 @@ class MainWindow(QMainWindow):
         start_time = time.perf_counter()
         for proxy_idx in self.table_view.selectionModel().selectedRows(COL_ID): # Specify column for row indexes
             src_idx = self.proxy_model.mapToSource(proxy_idx)
-            id_item = self.table_model.itemFromIndex(src_idx) # Use src_idx directly if it's for COL_ID
-            if id_item: ids.append(id_item.data(Qt.UserRole))
+            if src_idx.isValid(): ids.append(self.table_model.entry_id_at(src_idx.row()))
         end_time = time.perf_counter()
-        logging.debug(f"Got {len(ids)} selected IDs in {end_time - start_time:.4f} seconds.")
+        logging.debug("Got %s selected IDs in %.4f seconds.", len(ids), end_time - start_time)
         return ids
 
     def get_all_visible_entry_ids(self):
-        ids = []
         logging.debug("Getting all visible entry IDs...")
         start_time = time.perf_counter()
-        for row in range(self.proxy_model.rowCount()):
-            proxy_idx = self.proxy_model.index(row, COL_ID)
-            src_idx = self.proxy_model.mapToSource(proxy_idx)
-            id_item = self.table_model.itemFromIndex(src_idx)
-            if id_item: ids.append(id_item.data(Qt.UserRole))
+        self.table_model.fetch_all() # "Visible" means every row passing the filter, not only fetched pages
+        entry_id_at = self.table_model.entry_id_at
+        ids = [entry_id_at(row) for row in self.proxy_model.accepted_source_rows()]
         end_time = time.perf_counter()
-        logging.debug(f"Got {len(ids)} visible IDs in {end_time - start_time:.4f} seconds.")
+        logging.debug("Got %s visible IDs in %.4f seconds.", len(ids), end_time - start_time)
         return ids
 
     @Slot()
@@ -2488,6 +3648,9 @@ class MainWindow(QMainWindow):
         if self._is_checking_api:
             QMessageBox.warning(self, "Busy", "API check already in progress.")
             return
+        if self.import_thread is not None:
+            QMessageBox.warning(self, "Busy", "A file import is in progress. Check once it has finished.")
+            return
 
         self._is_checking_api = True
         num_entries = len(entry_ids)
@@ -2536,7 +3699,8 @@ class MainWindow(QMainWindow):
 
     @Slot(int, int)
     def update_progress_bar_values(self, current_val, total_val):
-        logging.debug(f"Main Thread: Received progress update: {current_val}/{total_val}")
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug("Main Thread: Received progress update: %s/%s", current_val, total_val)
         if self.progress_bar.maximum() != total_val:
             self.progress_bar.setMaximum(total_val)
         self.progress_bar.setValue(current_val)
@@ -2546,34 +3710,63 @@ class MainWindow(QMainWindow):
 
     @Slot(int, dict)
     def handle_api_result(self, entry_id, result_data):
-        logging.debug(f"GUI received API result for ID {entry_id}: {result_data.get('api_status', 'N/A')}")
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug("GUI received API result for ID %s: %s", entry_id, result_data.get('api_status', 'N/A'))
+        self._pending_status_results.append((entry_id, result_data))
+        if len(self._pending_status_results) >= STATUS_FLUSH_BATCH_SIZE:
+            self.flush_pending_status_updates()
+        elif not self._status_flush_timer.isActive():
+            self._status_flush_timer.start()
+
+    @Slot()
+    def flush_pending_status_updates(self):
+        self._status_flush_timer.stop()
+        results, self._pending_status_results = self._pending_status_results, []
+        if not results: return
+        checked_at = int(time.time()) # One timestamp for the whole flushed batch
+        if not update_entry_status_bulk([status_row(entry_id, data, checked_at) for entry_id, data in results]):
+            logging.error("Check results for %s entries were not saved; their rows are left as they were.", len(results))
+            return
         try:
-            update_entry_status(entry_id, result_data)
-            self.refresh_row_by_id(entry_id)
+            self.refresh_rows(get_entries_by_ids(entry_id for entry_id, _ in results))
         except Exception as e:
-            logging.error(f"Error handling API result for ID {entry_id} in GUI: {e}")
+            logging.error("Error refreshing %s checked rows in GUI: %s", len(results), e)
 
     def refresh_row_by_id(self, entry_id):
         entry_data = get_entry_by_id(entry_id)
         if not entry_data: return
+        self.refresh_rows([entry_data])
+
+    def refresh_rows(self, entries):
+        """Push re-read rows into the table in place; the proxy re-filters just the rows whose data changed.
+        If a row's sort column changed, the table is re-sorted through SQL, keeping the selection."""
+        category = self.current_category_filter
+        moved_out = []
+        resort = False
+        for entry in entries:
+            if category != "All Categories" and entry['category'] != category:
+                moved_out.append(entry['id']) # No longer belongs to the category on show
+                continue
+            old = self.table_model.entry_with_id(entry['id'])
+            if old is None or not self.table_model.update_entry(entry):
+                logging.warning("Could not find row for ID %s to refresh directly in source model.", entry['id'])
+            elif not resort:
+                resort = self._sort_value(old) != self._sort_value(entry)
+        if moved_out: self.table_model.remove_entries(moved_out)
+        if resort:
+            try:
+                reordered = self.table_model.reorder(get_sorted_entry_ids(
+                    category_filter=category, sort_key=COLUMN_SORT_KEYS[self.sort_column],
+                    descending=self.sort_order == Qt.DescendingOrder))
+            except Exception as e:
+                logging.error("Error re-sorting refreshed rows: %s", e)
+            else:
+                if not reordered: self.load_entries_to_table() # Rows came or went behind our back
 
-        new_row_items = self.create_row_items(entry_data)
-
-        for row in range(self.table_model.rowCount()):
-            source_id_item = self.table_model.item(row, COL_ID)
-            if source_id_item and source_id_item.data(Qt.UserRole) == entry_id:
-                for col, item_data in enumerate(new_row_items):
-                    existing_item = self.table_model.item(row, col)
-                    if existing_item:
-                        existing_item.setText(item_data.text())
-                        if col == COL_ID: existing_item.setData(item_data.data(Qt.UserRole), Qt.UserRole)
-                        if col == COL_STATUS: self.apply_status_coloring(existing_item, item_data.text())
-                    else:
-                        self.table_model.setItem(row, col, item_data)
-                self.proxy_model.invalidate()
-                return
-        logging.warning(f"Could not find row for ID {entry_id} to refresh directly in source model, or it's filtered. Proxy will update.")
-        self.proxy_model.invalidate()
+    def _sort_value(self, entry):
+        key = COLUMN_SORT_KEYS[self.sort_column]
+        if key in ENTRY_SORT_COMPUTED_KEYS: return EntryTableModel.display_text(entry, self.sort_column)
+        return entry[key]
 
     @Slot()
     def _clear_thread_references(self):
@@ -2600,6 +3793,7 @@ class MainWindow(QMainWindow):
     def on_api_worker_batch_finished(self):
         # Worker's internal processing loop has finished.
         # Status bar would have been updated by the worker with "Finished checking X/Y entries."
+        self.flush_pending_status_updates()
 
         if self.api_worker:
             self.api_worker.stop_processing() # Ensure its _is_running flag is false
@@ -2625,8 +3819,13 @@ class MainWindow(QMainWindow):
                 logging.warning("API thread did not stop gracefully. Forcing termination.")
                 self.api_thread.terminate() # Fallback if it doesn't quit
                 self.api_thread.wait() # Wait for termination
+        if self.import_thread and self.import_thread.isRunning():
+            self.import_worker.stop() # Stops at the next batch boundary; what was parsed so far is kept
+            self.import_thread.wait()
+        self.flush_pending_status_updates()
+        self.proxy_model.shutdown()
         event.accept()
-        logging.info(f"{APP_NAME} closing.")
+        logging.info("%s closing.", APP_NAME)
 
     def load_settings(self):
         try:
@@ -2638,7 +3837,7 @@ class MainWindow(QMainWindow):
             else:
                 self.set_theme("light") # Default to light theme if no settings file
         except Exception as e:
-            logging.error(f"Error loading settings: {e}")
+            logging.error("Error loading settings: %s", e)
             self.set_theme("light") # Default to light theme on error
 
     def save_settings(self):
@@ -2649,7 +3848,7 @@ class MainWindow(QMainWindow):
             with open(SETTINGS_FILE, 'w') as f:
                 json.dump(settings, f, indent=4)
         except Exception as e:
-            logging.error(f"Error saving settings: {e}")
+            logging.error("Error saving settings: %s", e)
 
     def set_theme(self, theme_name):
         """Applies the selected theme using ThemeManager."""
@@ -2667,7 +3866,7 @@ class MainWindow(QMainWindow):
             self.save_settings()
             self.refresh_table_coloring_on_theme_change()
         else:
-            logging.error(f"Failed to apply theme: {theme_name}")
+            logging.error("Failed to apply theme: %s", theme_name)
 
     def refresh_table_coloring_on_theme_change(self):
         """Refreshes the coloring of status items in the table after a theme change."""
@@ -2675,14 +3874,8 @@ class MainWindow(QMainWindow):
             return
 
         logging.debug("Refreshing table item coloring due to theme change.")
-        for row in range(self.table_model.rowCount()):
-            # Assuming COL_STATUS is the correct column index for the API status
-            status_item = self.table_model.item(row, COL_STATUS)
-            if status_item:
-                status_text = status_item.text()
-                self.apply_status_coloring(status_item, status_text)
-        # If using a proxy model, you might need to trigger an update for the view,
-        # but changing item properties directly often reflects. If not, further signals might be needed.
+        self._status_brushes.clear()
+        self.table_model.refresh_status_colors()
 
 
 # =============================================================================
@@ -2702,4 +3895,8 @@ if __name__ == "__main__":
 
     main_window = MainWindow()
     main_window.show()
-    sys.exit(app.exec())
+    exit_code = app.exec()
+    _POOL.close_all()
+    close_http_sessions()
+    close_checker_loop()
+    sys.exit(exit_code)
@@ -39,7 +39,7 @@ class ThemeManager:
             with open(config_path, 'r') as f:
                 self.config = json.load(f)
         except Exception as e:
-            logging.error(f"Failed to load theme config: {e}")
+            logging.error("Failed to load theme config: %s", e)
             self.config = {"themes": {}, "default": "light"}
 
     def get_stylesheet(self, theme_name):
@@ -49,7 +49,7 @@ class ThemeManager:
 
         theme_file = self.config.get("themes", {}).get(theme_name)
         if not theme_file:
-            logging.warning(f"Theme '{theme_name}' not found in config.")
+            logging.warning("Theme '%s' not found in config.", theme_name)
             return ""
 
         qss_path = resource_path(theme_file)
@@ -59,7 +59,7 @@ class ThemeManager:
                 self._qss_cache[theme_name] = qss_content
                 return qss_content
         except Exception as e:
-            logging.error(f"Failed to load QSS file {qss_path}: {e}")
+            logging.error("Failed to load QSS file %s: %s", qss_path, e)
             return ""
 
 class MediaPlayerManager:
@@ -164,17 +164,17 @@ class MediaPlayerManager:
             logging.error("ffprobe executable not found, though check passed. This is unexpected.")
             return None
         except subprocess.TimeoutExpired:
-            logging.error(f"ffprobe timed out analyzing stream: {stream_url}")
+            logging.error("ffprobe timed out analyzing stream: %s", stream_url)
             return None
         except subprocess.CalledProcessError as e:
-            logging.error(f"ffprobe failed with exit code {e.returncode} for stream: {stream_url}")
-            logging.error(f"ffprobe stderr: {e.stderr}")
+            logging.error("ffprobe failed with exit code %s for stream: %s", e.returncode, stream_url)
+            logging.error("ffprobe stderr: %s", e.stderr)
             return None
         except json.JSONDecodeError as e:
-            logging.error(f"Failed to decode JSON from ffprobe output: {e}")
+            logging.error("Failed to decode JSON from ffprobe output: %s", e)
             return None
         except Exception as e:
-            logging.error(f"An unexpected error occurred while running ffprobe: {e}")
+            logging.error("An unexpected error occurred while running ffprobe: %s", e)
             return None
 
     def play_stream(self, stream_url, parent_widget=None, referer_url=None, cookies=None, user_agent=None):
@@ -182,23 +182,23 @@ class MediaPlayerManager:
         Analyzes and plays a stream URL using the best available media player.
         """
         # 1. Analyze the stream
-        logging.info(f"Attempting to play stream: {stream_url}")
+        logging.info("Attempting to play stream: %s", stream_url)
         stream_info = self.get_stream_info(stream_url, referer_url, cookies, user_agent)
 
         if stream_info:
-            logging.info(f"Stream analysis successful for: {stream_url}")
+            logging.info("Stream analysis successful for: %s", stream_url)
             # Log format information
             if 'format' in stream_info:
                 format_info = stream_info['format']
-                logging.info(f"  Format: {format_info.get('format_long_name', 'N/A')}")
+                logging.info("  Format: %s", format_info.get('format_long_name', 'N/A'))
             # Log codec information for each stream
             if 'streams' in stream_info:
                 for stream in stream_info['streams']:
                     codec_type = stream.get('codec_type', 'unknown')
                     codec_name = stream.get('codec_long_name', 'N/A')
-                    logging.info(f"  - {codec_type.capitalize()} stream: {codec_name}")
+                    logging.info("  - %s stream: %s", codec_type.capitalize(), codec_name)
         else:
-            logging.warning(f"Could not analyze stream, proceeding with playback attempt: {stream_url}")
+            logging.warning("Could not analyze stream, proceeding with playback attempt: %s", stream_url)
 
         # 2. Select player and play
         player_to_use = None
@@ -214,7 +214,7 @@ class MediaPlayerManager:
 
         try:
             subprocess.Popen(command)
-            logging.info(f"Launched {player_to_use} with command: {' '.join(command)}")
+            logging.info("Launched %s with command: %s", player_to_use, ' '.join(command))
             return True
         except FileNotFoundError:
             self._show_player_not_found_error(parent_widget)
@@ -12,9 +12,19 @@ import string
 from urllib.parse import urlparse
 from datetime import datetime, timezone
 
+try:
+    import orjson # Optional: several times faster than json for large player_api payloads
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 # Constants
 USER_AGENT = 'IPTV Manager Pro/0.3 (okhttp/3.12.1)'
 API_TIMEOUT = 10
+MAX_CONNECTIONS_PER_HOST = 2 # Keep parallel checks from hammering a single provider
+XTREAM_CACHE_TTL = 60 # Seconds a successful player_api result is reused
+XTREAM_FAILURE_CACHE_TTL = 5 # Failures expire quickly so transient errors don't stick
+XTREAM_CACHE_MAX_ENTRIES = 2048
 DOWNLOAD_TIMEOUT = 10
 FFMPEG_TIMEOUT = 20  # Increased to allow for longer analysis
 
@@ -23,6 +33,8 @@ STALKER_API_PATH = "/stalker_portal/server/load.php"
 DEFAULT_TZ = "Europe/London"
 MAG_USER_AGENT = "Mozilla/5.0 (QtEmbedded; U; Linux; C) AppleWebKit/533.3 (KHTML, like Gecko) MAG200 stbapp ver: 2 rev: 250 Safari/533.3"
 
+_STREAM_ID_RE = re.compile(rb'"stream_id"\s*:\s*"?(\d+)"?')
+
 class IPTVChecker:
     """
     Core checking logic for IPTV credentials.
@@ -31,16 +43,39 @@ class IPTVChecker:
     2. Stream Connectivity Check (Disabled by default to avoid false negatives)
     """
 
+    # Keyed by credentials; class-level, so cached results outlive any one checker instance.
+    _xtream_cache = {}
+
     def __init__(self):
         self.session = None
 
+    @classmethod
+    def _cache_get(cls, key):
+        cached = cls._xtream_cache.get(key)
+        if cached is None:
+            return None
+        expires_at, result = cached
+        if time.monotonic() >= expires_at:
+            cls._xtream_cache.pop(key, None)
+            return None
+        return dict(result)
+
+    @classmethod
+    def _cache_put(cls, key, result):
+        ttl = XTREAM_CACHE_TTL if result.get('success') else XTREAM_FAILURE_CACHE_TTL
+        cache = cls._xtream_cache
+        cache.pop(key, None)
+        if len(cache) >= XTREAM_CACHE_MAX_ENTRIES:
+            cache.pop(next(iter(cache))) # Oldest insertion first
+        cache[key] = (time.monotonic() + ttl, dict(result))
+
     async def get_session(self):
         if self.session is None or self.session.closed:
             timeout = aiohttp.ClientTimeout(total=API_TIMEOUT)
             self.session = aiohttp.ClientSession(
                 headers={'User-Agent': USER_AGENT},
                 timeout=timeout,
-                connector=aiohttp.TCPConnector(ssl=False) # Often needed for IPTV providers with bad certs
+                connector=aiohttp.TCPConnector(ssl=False, limit_per_host=MAX_CONNECTIONS_PER_HOST) # ssl=False: often needed for IPTV providers with bad certs
             )
         return self.session
 
@@ -116,19 +151,29 @@ class IPTVChecker:
                  """
 
         except Exception as e:
-            logging.error(f"Unexpected error checking entry: {e}")
+            logging.error("Unexpected error checking entry: %s", e)
             result['api_message'] = f"Internal Error: {str(e)}"
 
         return result
 
     async def check_xtream_api(self, server_url, username, password):
+        if not server_url or not username:
+             return {'success': False, 'api_status': 'Error', 'api_message': "Missing URL or Username"}
+
+        cache_key = (server_url, username, password)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            logging.debug("Using cached player_api result for %s (%s)", server_url, username)
+            return cached
+
+        result = await self._check_xtream_api_uncached(server_url, username, password)
+        self._cache_put(cache_key, result)
+        return result
+
+    async def _check_xtream_api_uncached(self, server_url, username, password):
         session = await self.get_session()
         result = {'success': False, 'api_status': 'Error'}
 
-        if not server_url or not username:
-             result['api_message'] = "Missing URL or Username"
-             return result
-
         try:
             api_url = f"{server_url.rstrip('/')}/player_api.php"
             params = {'username': username, 'password': password}
@@ -138,19 +183,24 @@ class IPTVChecker:
                     result['api_message'] = f"HTTP {response.status}"
                     return result
 
+                body = await response.read()
                 try:
-                    data = await response.json()
-                except json.JSONDecodeError:
+                    data = _json_loads(body)
+                except ValueError: # json/orjson JSONDecodeError
                      # Some panels return empty body on failure or plain text
-                     text = await response.text()
+                     text = body.decode('utf-8', errors='replace')
                      result['api_message'] = f"Invalid JSON response: {text[:50]}"
                      return result
+                if not isinstance(data, dict):
+                     result['api_message'] = f"Unexpected JSON response: {type(data).__name__}"
+                     return result
 
                 user_info = data.get('user_info', {})
-                server_info = data.get('server_info', {})
 
-                result['raw_user_info'] = json.dumps(user_info)
-                result['raw_server_info'] = json.dumps(server_info)
+                # Store the response body as received (user_info and server_info together)
+                # instead of re-serialising the parsed sub-objects.
+                result['raw_user_info'] = body
+                result['raw_server_info'] = None
 
                 # Auth Check
                 auth = user_info.get('auth', 0)
@@ -216,7 +266,7 @@ class IPTVChecker:
         try:
             async with session.get(url, params=params) as resp:
                 if resp.status == 200:
-                    data = await resp.json()
+                    data = _json_loads(await resp.read())
                     if isinstance(data, list):
                         return {key: len(data)}
         except Exception:
@@ -287,8 +337,6 @@ class IPTVChecker:
 
                 # Stream the response and look for "stream_id": 12345
                 # JSON format: [{"num":1,"name":"...","stream_id":12345,...}, ...]
-                pattern = re.compile(rb'"stream_id"\s*:\s*"?(\d+)"?')
-
                 chunk_size = 8192
                 buffer = b""
 
@@ -297,12 +345,12 @@ class IPTVChecker:
                     chunk = await response.content.read(chunk_size)
                     if not chunk: break
                     buffer += chunk
-                    match = pattern.search(buffer)
+                    match = _STREAM_ID_RE.search(buffer)
                     if match:
                         return match.group(1).decode('utf-8')
 
         except Exception as e:
-            logging.warning(f"Error finding stream ID: {e}")
+            logging.warning("Error finding stream ID: %s", e)
         return None
 
     async def check_download_speed(self, url, duration=3, headers=None):
@@ -383,7 +431,7 @@ class IPTVChecker:
                 return True
 
         except (asyncio.TimeoutError, Exception) as e:
-            logging.debug(f"FFmpeg check failed: {e}")
+            logging.debug("FFmpeg check failed: %s", e)
 
         return False
 
@@ -458,7 +506,7 @@ class IPTVChecker:
                         'timezone': DEFAULT_TZ
                     }, response_url=url_obj)
                 except Exception as e:
-                    logging.warning(f"Failed to set initial cookies: {e}")
+                    logging.warning("Failed to set initial cookies: %s", e)
 
                 token = None
                 working_endpoint = None
@@ -472,7 +520,7 @@ class IPTVChecker:
                             working_endpoint = api_url
                             break
                     except Exception as e:
-                        logging.debug(f"Handshake failed for {endpoint}: {e}")
+                        logging.debug("Handshake failed for %s: %s", endpoint, e)
 
                 if not token or not working_endpoint:
                     result['api_message'] = "Handshake Failed (Invalid MAC or URL)"
@@ -489,10 +537,11 @@ class IPTVChecker:
 
                 # 3. Success
                 result['success'] = True
-                result['raw_user_info'] = json.dumps(profile)
+                raw_profile = json.dumps(profile)
+                result['raw_user_info'] = raw_profile
 
                 # DEBUG: Log profile to see date formats
-                logging.debug(f"Stalker Profile Data: {json.dumps(profile)}")
+                logging.debug("Stalker Profile Data: %s", raw_profile)
 
                 # Parse Status
                 result['api_status'] = 'Active'
@@ -524,7 +573,7 @@ class IPTVChecker:
 
         except Exception as e:
             result['api_message'] = f"Stalker Error: {str(e)}"
-            logging.error(f"Stalker Check Critical Error: {e}")
+            logging.error("Stalker Check Critical Error: %s", e)
 
         return result
 
@@ -606,9 +655,9 @@ class IPTVChecker:
                     token = data.get('js', {}).get('token')
                     if token: return token
                 else:
-                    logging.debug(f"Handshake HTTP {resp.status} for {api_url}")
+                    logging.debug("Handshake HTTP %s for %s", resp.status, api_url)
         except Exception as e:
-            logging.debug(f"Stalker Handshake Error for {api_url}: {e}")
+            logging.debug("Stalker Handshake Error for %s: %s", api_url, e)
 
         # Fallback: Generate token manually
         try:
@@ -624,7 +673,7 @@ class IPTVChecker:
                 if resp2.status == 200:
                     return token
         except Exception as e:
-            logging.debug(f"Stalker Handshake Fallback Error: {e}")
+            logging.debug("Stalker Handshake Fallback Error: %s", e)
 
         return None
 
@@ -692,9 +741,9 @@ class IPTVChecker:
 
                     return js_data
                 else:
-                    logging.error(f"Stalker Get Profile Failed: HTTP {resp.status} | URL: {resp.url} | Body Snippet: {(await resp.text())[:200]}")
+                    logging.error("Stalker Get Profile Failed: HTTP %s | URL: %s | Body Snippet: %s", resp.status, resp.url, (await resp.text())[:200])
         except Exception as e:
-            logging.error(f"Stalker Get Profile Exception: {e}")
+            logging.error("Stalker Get Profile Exception: %s", e)
 
         return None
 
@@ -1,5 +1,6 @@
 from PySide6.QtCore import QThread, Signal
 import logging
+import threading
 from stalker_integration import StalkerPortal
 
 logger = logging.getLogger(__name__)
@@ -11,13 +12,23 @@ class EpgManager(QThread):
         super().__init__()
         self.portal_url = portal_url
         self.mac_address = mac_address
-        self.queue = []
+        self.queue = {} # Ordered set of pending channel ids
+        self._queue_lock = threading.Lock()
+        self._bulk_supported = True
         self._is_running = True
         self.portal = None
 
     def request_epg(self, channel_id):
-        if channel_id not in self.queue:
-            self.queue.append(channel_id)
+        self.request_epg_batch((channel_id,))
+
+    def request_epg_batch(self, channel_ids):
+        with self._queue_lock:
+            self.queue.update(dict.fromkeys(channel_ids))
+
+    def _take_pending(self):
+        with self._queue_lock:
+            pending, self.queue = list(self.queue), {}
+        return pending
 
     def stop(self):
         self._is_running = False
@@ -32,19 +43,39 @@ class EpgManager(QThread):
         # Initialize one portal session for the EPG thread
         try:
             self.portal = StalkerPortal(self.portal_url, self.mac_address)
-            if not self.portal.handshake():
+            if not self.portal.handshake(): # get_epg authenticates the profile on first use
                  logger.error("EPG Manager: Handshake failed.")
                  return
-            self.portal.get_profile() # Ensure valid session
         except Exception as e:
             logger.error(f"EPG Manager: Initialization failed: {e}")
             return
 
         while self._is_running and not self.isInterruptionRequested():
-            if self.queue:
-                ch_id = self.queue.pop(0)
+            # Everything queued while we slept goes out together
+            pending = self._take_pending()
+            if not pending:
+                self.msleep(500)
+                continue
+
+            if self._bulk_supported and len(pending) > 1:
+                # Fetch EPG for next 2 hours (7200s) for all pending channels in one request
+                try:
+                    batch = self.portal.get_epg_batch(pending, period=7200)
+                except Exception as e:
+                    # Only this request failed; these channels go out one by one below
+                    logger.error(f"EPG batch fetch error: {e}")
+                else:
+                    if batch is not None: # A map, even an empty one, means the portal does bulk EPG
+                        for ch_id, data in batch.items():
+                            self.epg_ready.emit(ch_id, data)
+                        continue
+                    logger.info("EPG Manager: Portal has no bulk EPG, falling back to per-channel requests.")
+                    self._bulk_supported = False
+
+            for ch_id in pending:
+                if not self._is_running or self.isInterruptionRequested():
+                    break
                 try:
-                    # Fetch EPG for next 2 hours (7200s)
                     data = self.portal.get_epg(ch_id, period=7200)
                     if data:
                         self.epg_ready.emit(str(ch_id), data)
@@ -52,5 +83,3 @@ class EpgManager(QThread):
                     logger.error(f"EPG fetch error for {ch_id}: {e}")
 
                 self.msleep(200)
-            else:
-                self.msleep(500)
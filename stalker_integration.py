@@ -3,14 +3,22 @@ import hashlib
 import time
 import json
 import logging
+import re
 import random
 import string
 from urllib.parse import urlparse, quote
 
+try:
+    import orjson # Optional: decodes the response bytes directly, skipping the str decode of .json()
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 # Constants matching those in core_checker.py for consistency
 STALKER_API_PATH = "/stalker_portal/server/load.php"
 DEFAULT_TZ = "Europe/London"
 MAG_USER_AGENT = "Mozilla/5.0 (QtEmbedded; U; Linux; C) AppleWebKit/533.3 (KHTML, like Gecko) MAG200 stbapp ver: 2 rev: 250 Safari/533.3"
+_SEASON_NUMBER_RE = re.compile(r'(\d+)')
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +46,7 @@ class StalkerPortal:
         })
 
         self.token = None
+        self.profile = None # Last get_profile() result
 
         # Hardware identifiers
         self.serial = self._generate_serial(self.mac_address)
@@ -79,9 +88,11 @@ class StalkerPortal:
 
     def handshake(self):
         """
-        Performs the initial handshake to obtain a token.
+        Performs the initial handshake to obtain a token, trying each known endpoint.
         Implements fallback logic for strict portals and multiple endpoints.
+        The API methods below authenticate the new token lazily via ensure_profile().
         """
+        self.profile = None # A new token needs its own get_profile
         endpoints = [
             "/stalker_portal/server/load.php",
             "/server/load.php",
@@ -98,7 +109,7 @@ class StalkerPortal:
                 resp = self.session.get(current_api_url, params=params, timeout=10)
                 if resp.status_code == 200:
                     try:
-                        data = resp.json()
+                        data = _json_loads(resp.content)
                         token = data.get('js', {}).get('token')
                         if token:
                             self.token = token
@@ -122,7 +133,7 @@ class StalkerPortal:
                     if resp.status_code == 200:
                         try:
                             # Verify valid JSON response
-                            resp.json()
+                            _json_loads(resp.content)
                             self.token = token
                             self.session.cookies.update({'token': token})
                             self.api_url = current_api_url # Store working endpoint
@@ -171,7 +182,7 @@ class StalkerPortal:
         try:
             resp = self.session.get(self.api_url, params=params, headers=headers, timeout=10)
             resp.raise_for_status()
-            data = resp.json()
+            data = _json_loads(resp.content)
             js_data = data.get('js', {})
 
             # Token rotation check
@@ -182,17 +193,25 @@ class StalkerPortal:
             if not js_data or 'id' not in js_data:
                  raise Exception("Authentication failed (Invalid Profile Data)")
 
+            self.profile = js_data
             return js_data
 
         except Exception as e:
             logger.error(f"Get Profile error: {e}")
             raise
 
+    def ensure_profile(self):
+        """Runs get_profile() once per token; every API call below goes through this first."""
+        if self.profile is None:
+            self.get_profile()
+        return self.profile
+
     def get_categories(self, type_val):
         """
         Fetches categories/genres.
         type_val: 'itv' (Live), 'vod' (Movies), 'series' (Series)
         """
+        self.ensure_profile()
         action = 'get_genres' if type_val == 'itv' else 'get_categories'
         params = {
             'type': type_val,
@@ -204,7 +223,7 @@ class StalkerPortal:
 
         try:
             resp = self.session.get(self.api_url, params=params, headers=headers, timeout=10)
-            data = resp.json()
+            data = _json_loads(resp.content)
             return data.get('js', [])
         except Exception as e:
             logger.error(f"Error fetching categories for {type_val}: {e}")
@@ -215,6 +234,7 @@ class StalkerPortal:
         Fetches streams for a category.
         Handles pagination internally to get all items (or a large limit).
         """
+        self.ensure_profile()
         params = {
             'type': type_val,
             'action': 'get_ordered_list',
@@ -233,7 +253,7 @@ class StalkerPortal:
         try:
             # Fetch page 1
             resp = self.session.get(self.api_url, params=params, headers=headers, timeout=10)
-            data = resp.json()
+            data = _json_loads(resp.content)
             js_data = data.get('js', {})
             items = js_data.get('data', [])
             total_items = int(js_data.get('total_items', 0))
@@ -252,7 +272,7 @@ class StalkerPortal:
                     params['p'] = p
                     try:
                         r = self.session.get(self.api_url, params=params, headers=headers, timeout=5)
-                        p_data = r.json().get('js', {}).get('data', [])
+                        p_data = _json_loads(r.content).get('js', {}).get('data', [])
                         all_items.extend(p_data)
                     except Exception:
                         break
@@ -267,6 +287,7 @@ class StalkerPortal:
         """
         Generates a temporary playback link.
         """
+        self.ensure_profile()
         params = {
             'type': type_val,
             'action': 'create_link',
@@ -278,7 +299,7 @@ class StalkerPortal:
 
         try:
             resp = self.session.get(self.api_url, params=params, headers=headers, timeout=10)
-            data = resp.json()
+            data = _json_loads(resp.content)
             link = data.get('js', {}).get('cmd')
 
             if link and link.startswith('ffmpeg '):
@@ -294,6 +315,7 @@ class StalkerPortal:
         Fetches EPG for a specific channel.
         period: seconds to look ahead (default 1 hour)
         """
+        self.ensure_profile()
         params = {
             'type': 'itv',
             'action': 'get_epg_info',
@@ -305,15 +327,42 @@ class StalkerPortal:
 
         try:
             resp = self.session.get(self.api_url, params=params, headers=headers, timeout=5)
-            data = resp.json()
+            data = _json_loads(resp.content)
             return data.get('js', {}).get('data', [])
         except Exception:
             return []
 
+    def get_epg_batch(self, channel_ids, period=3600):
+        """
+        Fetches EPG for several channels with one get_epg_info call.
+        Without ch_id the portal answers with a {ch_id: [programs]} map for
+        every channel; only the requested ids are kept.
+        Returns None if the portal does not support the bulk form (its reply is not a map);
+        a failed request (auth, network, bad JSON) raises.
+        """
+        params = {
+            'type': 'itv',
+            'action': 'get_epg_info',
+            'period': period,
+            'JsHttpRequest': '1-xml'
+        }
+
+        self.ensure_profile()
+        headers = {'Authorization': f'Bearer {self.token}'}
+        resp = self.session.get(self.api_url, params=params, headers=headers, timeout=15)
+        reply = _json_loads(resp.content)
+        data = reply.get('js', {}) if isinstance(reply, dict) else None
+        data = data.get('data', {}) if isinstance(data, dict) else None
+        if not isinstance(data, dict):
+            return None
+        wanted = set(map(str, channel_ids))
+        return {str(ch_id): programs for ch_id, programs in data.items() if str(ch_id) in wanted and programs}
+
     def get_series_episodes(self, series_id):
         """
         Fetches episodes for a series. Handles seasons if present.
         """
+        self.ensure_profile()
         # 1. Try to get seasons first (season_id=0 usually returns seasons list)
         params = {
             'type': 'vod',
@@ -327,7 +376,7 @@ class StalkerPortal:
         episodes = []
         try:
             resp = self.session.get(self.api_url, params=params, headers=headers, timeout=10)
-            data = resp.json()
+            data = _json_loads(resp.content)
             items = data.get('js', {}).get('data', [])
 
             if not items:
@@ -353,8 +402,7 @@ class StalkerPortal:
 
                 # Extract season number if possible (e.g. "Season 1")
                 season_num = 0
-                import re
-                match = re.search(r'(\d+)', season_name)
+                match = _SEASON_NUMBER_RE.search(season_name)
                 if match:
                     season_num = int(match.group(1))
 
@@ -364,7 +412,7 @@ class StalkerPortal:
 
                 try:
                     r2 = self.session.get(self.api_url, params=p2, headers=headers, timeout=5)
-                    d2 = r2.json().get('js', {}).get('data', [])
+                    d2 = _json_loads(r2.content).get('js', {}).get('data', [])
 
                     for ep in d2:
                         ep['season_num'] = season_num